@@ -0,0 +1,378 @@
+"""Бенчмарки производительности API.
+
+Каждый бенчмарк наполняет базу синтетическими данными, замеряет время
+ответа эндпоинтов и печатает таблицу результатов. Запускаются командой
+`python manage.py benchmark <имя> --rows N`; все данные создаются
+внутри транзакции, которая откатывается по завершении.
+"""
+import random
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+BATCH_SIZE = 5000
+BENCHMARKS = {}
+SYLLABLES = (
+    "ба ве го да жи зо ка ле ми но пу ра си то фу ха це чи ша ю"
+).split()
+
+factory = APIRequestFactory()
+
+
+def benchmark(name):
+    """Регистрирует функцию как бенчмарк с именем name."""
+
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def measure(func, repeat=5):
+    """Возвращает лучшее время выполнения func в миллисекундах."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def call_view(viewset, path, params=None, actions=None, **kwargs):
+    """Выполняет GET-запрос к представлению и отрисовывает ответ."""
+    view = viewset.as_view(actions or {"get": "list"})
+    response = view(factory.get(path, params or {}), **kwargs)
+    response.render()
+    assert response.status_code == 200, response.content[:200]
+    return response
+
+
+def report(stdout, title, rows):
+    """Печатает результаты замеров в виде таблицы."""
+    stdout.write(title)
+    width = max(len(name) for name, _ in rows)
+    for name, elapsed in rows:
+        stdout.write(f"  {name.ljust(width)}  {elapsed:10.2f} мс")
+
+
+def seed_users(count, prefix="bench"):
+    User.objects.bulk_create(
+        (
+            User(username=f"{prefix}{idx}", email=f"{prefix}{idx}@yamdb.fake")
+            for idx in range(count)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    return list(
+        User.objects.filter(username__startswith=prefix).values_list(
+            "id", flat=True
+        )
+    )
+
+
+def seed_title_with_reviews(count):
+    """Создаёт одно произведение с count отзывами разных авторов."""
+    category = Category.objects.create(name="Бенчмарк", slug="benchmark")
+    title = Title.objects.create(
+        name="Бенчмарк", year=2000, category=category
+    )
+    Review.objects.bulk_create(
+        (
+            Review(
+                text=f"Отзыв {idx}",
+                author_id=author_id,
+                score=idx % 10 + 1,
+                title=title,
+            )
+            for idx, author_id in enumerate(seed_users(count))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    Title.objects.filter(pk=title.pk).rebuild_ratings()
+    return title
+
+
+@benchmark("pagination")
+def pagination_benchmark(rows, stdout):
+    """Сравнивает OFFSET- и keyset-пагинацию отзывов на глубоких страницах."""
+    from api.pagination import KeysetPagination
+    from api.views import ReviewViewSet
+
+    title = seed_title_with_reviews(rows)
+    path = f"/api/v1/titles/{title.pk}/reviews/"
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    last_page = max(1, -(-rows // page_size))
+    ordering = ReviewViewSet.keyset_ordering
+
+    def cursor_at(offset):
+        if offset == 0:
+            return {"pagination": "cursor"}
+        values = list(
+            Review.objects.filter(title=title)
+            .order_by(*ordering)
+            .values_list("pub_date", "id")[offset - 1]
+        )
+        paginator = KeysetPagination(ordering, page_size)
+        paginator.fields = [
+            Review._meta.get_field(name.lstrip("-")) for name in ordering
+        ]
+        return {"cursor": paginator.make_cursor(False, values)}
+
+    results = []
+    for label, page in (
+        ("первая", 1),
+        ("середина", last_page // 2 or 1),
+        ("последняя", last_page),
+    ):
+        offset = (page - 1) * page_size
+        page_params = {"page": page}
+        cursor_params = cursor_at(offset)
+        results.append(
+            (
+                f"page={page} ({label})",
+                measure(
+                    lambda: call_view(
+                        ReviewViewSet, path, page_params, title_id=title.pk
+                    )
+                ),
+            )
+        )
+        results.append(
+            (
+                f"cursor ({label})",
+                measure(
+                    lambda: call_view(
+                        ReviewViewSet, path, cursor_params, title_id=title.pk
+                    )
+                ),
+            )
+        )
+    report(stdout, f"Пагинация отзывов, {rows} строк:", results)
+
+
+def make_vocabulary(size, seed=0):
+    """Словарь из size синтетических слов по 3-4 слога."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(3, 4))))
+    return sorted(words)
+
+
+def seed_titles(count, category=None, seed=0):
+    """Создаёт count произведений со случайными названиями и описаниями."""
+    rng = random.Random(seed)
+    words = make_vocabulary(20000, seed)
+    Title.objects.bulk_create(
+        (
+            Title(
+                name=" ".join(rng.sample(words, 3)),
+                description=" ".join(rng.choices(words, k=20)),
+                year=rng.randint(1900, 2020),
+                category=category,
+            )
+            for _ in range(count)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+@benchmark("search")
+def search_benchmark(rows, stdout):
+    """Сравнивает поиск FTS5 и icontains по названию и описанию."""
+    from api.views import TitleViewSet
+    from reviews.search import search_titles
+
+    seed_titles(rows)
+    words = make_vocabulary(20000)
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    queryset = Title.objects.order_by("id")
+    results = []
+    for text in (words[100], f"{words[200]} {words[300]}", words[400][:4]):
+        terms = text.split()
+        condition = Q()
+        for term in terms:
+            condition &= Q(name__icontains=term) | Q(
+                description__icontains=term
+            )
+        icontains = queryset.filter(condition)
+        fts = search_titles(queryset, text)
+        results.append(
+            (
+                f"icontains «{text}»",
+                measure(
+                    lambda: (icontains.count(), list(icontains[:page_size]))
+                ),
+            )
+        )
+        results.append(
+            (
+                f"fts5 «{text}»",
+                measure(lambda: (fts.count(), list(fts[:page_size]))),
+            )
+        )
+        results.append(
+            (
+                f"GET /titles/?search={text}",
+                measure(
+                    lambda: call_view(
+                        TitleViewSet, "/api/v1/titles/", {"search": text}
+                    )
+                ),
+            )
+        )
+    report(stdout, f"Поиск по произведениям, {rows} строк:", results)
+
+
+def seed_comments(review, count):
+    """Создаёт count комментариев разных авторов к отзыву review."""
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                text=f"Комментарий {idx}", author_id=author_id, review=review
+            )
+            for idx, author_id in enumerate(seed_users(count, "commenter"))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+@benchmark("serialization")
+def serialization_benchmark(rows, stdout):
+    """Сравнивает сериализаторы DRF и сериализацию через values()
+    на страницах из 5, 100 и 1000 объектов. В обоих вариантах
+    связанные объекты загружаются заранее, поэтому замеряется
+    выборка строк и сборка ответа, а не лишние запросы.
+    """
+    from api.serializers import (
+        CommentSerializer,
+        CommentValuesSerializer,
+        ReviewSerializer,
+        ReviewValuesSerializer,
+        TitleSerializer,
+        TitleValuesSerializer,
+    )
+
+    category = Category.objects.create(name="Бенчмарк", slug="bench")
+    genres = [
+        Genre.objects.create(name=f"Жанр {idx}", slug=f"bench-{idx}")
+        for idx in range(3)
+    ]
+    seed_titles(rows, category)
+    GenreTitle.objects.bulk_create(
+        (
+            GenreTitle(title_id=title_id, genre=genre)
+            for title_id in Title.objects.values_list("id", flat=True)
+            for genre in genres[: title_id % len(genres) + 1]
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    review = seed_title_with_reviews(rows).reviews.first()
+    seed_comments(review, rows)
+    cases = (
+        (
+            "произведения",
+            TitleSerializer,
+            TitleValuesSerializer,
+            Title.objects.select_related("category")
+            .prefetch_related("genre")
+            .order_by("id"),
+        ),
+        (
+            "отзывы",
+            ReviewSerializer,
+            ReviewValuesSerializer,
+            Review.objects.select_related("author").order_by(
+                "-pub_date", "-id"
+            ),
+        ),
+        (
+            "комментарии",
+            CommentSerializer,
+            CommentValuesSerializer,
+            review.comments.select_related("author").order_by(
+                "-pub_date", "-id"
+            ),
+        ),
+    )
+    results = []
+    for name, serializer_class, values_serializer_class, queryset in cases:
+        for size in (5, 100, 1000):
+            values_serializer = values_serializer_class()
+
+            def serialize():
+                return serializer_class(list(queryset[:size]), many=True).data
+
+            def serialize_values():
+                return values_serializer.to_representation(
+                    list(values_serializer.get_values(queryset)[:size])
+                )
+
+            assert serialize() == serialize_values(), name
+            results.append((f"{name}, {size}: serializer", measure(serialize)))
+            results.append(
+                (f"{name}, {size}: values()", measure(serialize_values))
+            )
+    report(stdout, f"Сериализация списков, {rows} строк:", results)
+
+
+def count_queries(func):
+    """Возвращает количество запросов к БД, выполненных func."""
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return len(context.captured_queries)
+
+
+@benchmark("nested_queries")
+def nested_queries_benchmark(rows, stdout):
+    """Количество запросов к БД для отзывов и комментариев: на первой
+    и последней странице, курсорной странице и отдельном объекте.
+    Имя автора выбирается вместе с объектом, поэтому количество
+    не зависит ни от размера страницы, ни от числа авторов.
+    """
+    from api.views import CommentViewSet, ReviewViewSet
+
+    title = seed_title_with_reviews(rows)
+    review = title.reviews.first()
+    seed_comments(review, rows)
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    last_page = max(1, -(-rows // page_size))
+    cases = (
+        (
+            "отзывы",
+            ReviewViewSet,
+            f"/api/v1/titles/{title.pk}/reviews/",
+            {"title_id": title.pk},
+            review.pk,
+        ),
+        (
+            "комментарии",
+            CommentViewSet,
+            f"/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/",
+            {"title_id": title.pk, "review_id": review.pk},
+            review.comments.values_list("pk", flat=True).first(),
+        ),
+    )
+    stdout.write(f"Запросы к БД для вложенных списков, {rows} строк:")
+    for name, viewset, path, kwargs, pk in cases:
+        for label, params, actions, extra in (
+            ("page=1", {"page": 1}, None, {}),
+            (f"page={last_page}", {"page": last_page}, None, {}),
+            ("cursor", {"pagination": "cursor"}, None, {}),
+            ("объект", None, {"get": "retrieve"}, {"pk": pk}),
+        ):
+            queries = count_queries(
+                lambda: call_view(
+                    viewset, path, params, actions, **kwargs, **extra
+                )
+            )
+            stdout.write(f"  {name}, {label}: {queries}")
@@ -0,0 +1,116 @@
+"""Версии ресурсов для кэширования ответов API.
+
+Каждой области данных (весь каталог, жанры и категории, отдельное
+произведение) соответствует счётчик версии в таблице CacheVersion.
+Ключи закэшированных ответов включают текущие версии, поэтому для
+инвалидации достаточно увеличить счётчик: старые ключи просто перестают
+запрашиваться и вытесняются по таймауту. Счётчик увеличивается
+в транзакции записи, поэтому новая версия становится видна вместе
+с изменёнными данными, а сам кэш ответов может быть локальным
+для процесса.
+
+В пределах запроса версии читаются один раз (remember_versions,
+см. api.middleware): первым запросом к БД вместе с нужными областями
+выбираются и все общие области.
+"""
+import math
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from reviews.models import CacheVersion
+
+CATALOG = "catalog"
+# Состав произведений и поля, по которым они фильтруются. В отличие
+# от CATALOG не меняется при записи отзывов.
+TITLES = "titles"
+TAXONOMY = "taxonomy"
+AUTHORS = "authors"
+USERS = "users"
+GENRE_LINKS = "genre-links"
+COMMON_SCOPES = (CATALOG, TITLES, TAXONOMY, AUTHORS, USERS, GENRE_LINKS)
+
+_known_versions = ContextVar("known_versions", default=None)
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def title_scope(title_id):
+    return f"title:{title_id}"
+
+
+def review_scope(review_id):
+    return f"review:{review_id}"
+
+
+def author_scope(author_id):
+    return f"author:{author_id}"
+
+
+@contextmanager
+def remember_versions():
+    """Запоминает прочитанные версии до выхода из блока."""
+    token = _known_versions.set({})
+    try:
+        yield
+    finally:
+        _known_versions.reset(token)
+
+
+def _load_versions(scopes):
+    """Пары (версия, время изменения) областей scopes.
+    Область без записи получает версию и время изменения области
+    CacheVersion.EPOCH, а если нет и её — версию 0 без времени.
+    """
+    known = _known_versions.get()
+    if known is None:
+        known = {}
+    missing = set(scopes) - set(known)
+    if missing:
+        if not known:
+            missing.update(COMMON_SCOPES)
+        rows = CacheVersion.objects.filter(
+            scope__in=missing | {CacheVersion.EPOCH}
+        ).values_list("scope", "version", "modified_at")
+        found = {scope: values for scope, *values in rows}
+        default = found.get(CacheVersion.EPOCH, [0, None])
+        for scope in missing:
+            known[scope] = found.get(scope, default)
+    return [known[scope] for scope in scopes]
+
+
+def get_versions(*scopes):
+    """Возвращает текущие версии областей scopes."""
+    return tuple(version for version, _ in _load_versions(scopes))
+
+
+def bump_versions(*scopes):
+    """Увеличивает версии областей scopes в текущей транзакции."""
+    CacheVersion.objects.bump_scopes(scopes)
+    known = _known_versions.get()
+    if known is not None:
+        known.clear()
+
+
+def get_last_modified(*scopes):
+    """Возвращает время последнего изменения областей scopes
+    в секундах (с округлением вверх) или None, если оно неизвестно.
+    """
+    modified = [value for _, value in _load_versions(scopes)]
+    if None in modified:
+        return None
+    return math.ceil(max(modified))
+
+
+def record_cache_event(name, event):
+    """Считает попадания и промахи кэша name в памяти процесса."""
+    with _stats_lock:
+        _stats[name, event] += 1
+
+
+def get_cache_stats(name):
+    """Возвращает количество попаданий и промахов кэша name
+    в текущем процессе.
+    """
+    return {event: _stats[name, event] for event in ("hits", "misses")}
@@ -0,0 +1,93 @@
+"""Потоковая выгрузка каталога произведений.
+
+Произведения читаются порциями через iterator(chunk_size), жанры
+загружаются одним запросом на порцию, а строки NDJSON или CSV
+отдаются по мере готовности. Поэтому память не зависит от размера
+каталога. Выгрузка может сжиматься gzip на лету.
+"""
+import csv
+import io
+import json
+import zlib
+from itertools import islice
+
+from .serializers import TitleValuesSerializer
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+CSV_FIELDS = (
+    "id",
+    "name",
+    "year",
+    "description",
+    "rating",
+    "genre",
+    "category",
+)
+# Формат gzip: заголовок и контрольная сумма (см. zlib.compressobj).
+GZIP_WBITS = 31
+
+
+def iter_titles(queryset, chunk_size, expand=None):
+    """Возвращает произведения в представлении API порциями
+    по chunk_size. Для CSV связи выводятся слагами (expand=[]).
+    """
+    serializer = TitleValuesSerializer(context={"expand": expand})
+    rows = serializer.get_values(queryset.order_by("id")).iterator(
+        chunk_size=chunk_size
+    )
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield serializer.to_representation(chunk)
+
+
+def iter_ndjson(queryset, chunk_size):
+    for titles in iter_titles(queryset, chunk_size):
+        yield "".join(
+            json.dumps(title, ensure_ascii=False) + "\n" for title in titles
+        )
+
+
+def pop_text(buffer):
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+def iter_csv(queryset, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_FIELDS)
+    yield pop_text(buffer)
+    for titles in iter_titles(queryset, chunk_size, expand=[]):
+        for title in titles:
+            title["genre"] = ",".join(title["genre"])
+            writer.writerow([title[name] for name in CSV_FIELDS])
+        yield pop_text(buffer)
+
+
+def compress(chunks):
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_titles(queryset, file_format, chunk_size, gzip=False):
+    """Генератор байтов выгрузки произведений queryset
+    в формате file_format (ndjson или csv).
+    """
+    writer = iter_ndjson if file_format == "ndjson" else iter_csv
+    chunks = (text.encode() for text in writer(queryset, chunk_size))
+    return compress(chunks) if gzip else chunks
+
+
+def get_filename(file_format, gzip=False):
+    return f"titles.{file_format}" + (".gz" if gzip else "")
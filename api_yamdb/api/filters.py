@@ -1,17 +1,124 @@
+import json
+
 import django_filters
+from django.db import connections
+from django.db.models.expressions import RawSQL
 
+from api_yamdb.constants import GENRE_FILTER_MAX_IDS
 from reviews.models import Title
+from reviews.search import search_titles
+from .registry import CATEGORIES, GENRE_INDEX, GENRES
+
+GENRE_MODES = (
+    ("all", "Все жанры"),
+    ("any", "Хотя бы один жанр"),
+)
+# Поля сортировки произведений, у каждого есть индекс (поле, id).
+ORDERING_FIELDS = (
+    ("rating", "рейтингу"),
+    ("year", "году"),
+    ("name", "названию"),
+    ("review_count", "количеству отзывов"),
+)
+ORDERINGS = tuple(
+    choice
+    for name, label in ORDERING_FIELDS
+    for choice in (
+        (name, f"По {label}"),
+        (f"-{name}", f"По {label}, по убыванию"),
+    )
+)
+
+
+def id_list(ids, using):
+    """Условие pk__in для списка id. Длинный список передаётся одним
+    параметром-массивом: в запросе не больше параметров, чем допускает
+    SQLite, и нет соединений со связями.
+    """
+    if len(ids) <= GENRE_FILTER_MAX_IDS:
+        return ids
+    vendor = connections[using].vendor
+    if vendor == "sqlite":
+        return RawSQL("SELECT value FROM json_each(%s)", [json.dumps(ids)])
+    if vendor == "postgresql":
+        return RawSQL("SELECT unnest(%s::bigint[])", [ids])
+    return ids
 
 
 class TitleFilter(django_filters.FilterSet):
     """Фильтр для модели Title.
     Фильтр позволяет фильтровать произведения по различным полям,
-    в том числе по слагу жанра и категории.
+    в том числе по слагу жанра и категории, и искать по тексту.
+    Слаги разрешаются по реестру в памяти (см. api.registry),
+    поэтому таблицы жанров и категорий в запрос не попадают.
+    В genre можно передать несколько слагов через запятую:
+    genre_mode=all (по умолчанию) оставляет произведения со всеми
+    жанрами, genre_mode=any — хотя бы с одним.
+    Параметр ordering задаёт сортировку (см. ORDERING_FIELDS).
     """
 
-    genre = django_filters.CharFilter(field_name="genre__slug")
-    category = django_filters.CharFilter(field_name="category__slug")
+    genre = django_filters.CharFilter(method="filter_genre")
+    genre_mode = django_filters.ChoiceFilter(
+        choices=GENRE_MODES, method="filter_genre_mode"
+    )
+    category = django_filters.CharFilter(method="filter_category")
+    search = django_filters.CharFilter(method="filter_search")
+    ordering = django_filters.ChoiceFilter(
+        choices=ORDERINGS, method="filter_ordering"
+    )
 
     class Meta:
         model = Title
-        fields = ("category", "genre", "year", "name")
+        fields = (
+            "category",
+            "genre",
+            "genre_mode",
+            "year",
+            "name",
+            "search",
+            "ordering",
+        )
+
+    def filter_genre(self, queryset, name, value):
+        """Один жанр фильтруется запросом по индексу связей,
+        несколько — по битовым картам GENRE_INDEX (см. api.registry)
+        и списку id (см. id_list).
+        """
+        slugs = {slug.strip() for slug in value.split(",")} - {""}
+        if not slugs:
+            return queryset
+        match_all = self.form.cleaned_data.get("genre_mode") != "any"
+        genres = GENRES.get_many(slugs)
+        if not genres or match_all and len(genres) < len(slugs):
+            return queryset.none()
+        genre_ids = [genre.pk for genre in genres.values()]
+        if len(genre_ids) == 1:
+            return queryset.filter(genre=genre_ids[0])
+        bitmap = GENRE_INDEX.match(genre_ids, match_all)
+        if not bitmap:
+            return queryset.none()
+        title_ids = GENRE_INDEX.title_ids(bitmap)
+        return queryset.filter(pk__in=id_list(title_ids, queryset.db))
+
+    def filter_genre_mode(self, queryset, name, value):
+        # Режим учитывается в filter_genre.
+        return queryset
+
+    def filter_category(self, queryset, name, value):
+        category = CATEGORIES.get(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category=category.pk)
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию
+        с сортировкой по релевантности.
+        """
+        return search_titles(queryset, value)
+
+    def filter_ordering(self, queryset, name, value):
+        """Сортировка с id в том же направлении для однозначного
+        порядка страниц; читается по индексу (поле, id).
+        Применяется последней и заменяет сортировку поиска.
+        """
+        return queryset.order_by(value, "-id" if value[0] == "-" else "id")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from api.benchmarks import BENCHMARKS
+
+NO_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+}
+
+
+class Command(BaseCommand):
+    """Запуск бенчмарков производительности API.
+
+    Синтетические данные создаются в транзакции, которая
+    откатывается после замеров, поэтому база не изменяется.
+    Кэш ответов на время замеров отключается.
+    """
+
+    help = "Запуск бенчмарков производительности API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(BENCHMARKS))
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1_000_000,
+            help="Количество строк синтетических данных.",
+        )
+
+    def handle(self, *args, **options):
+        """Метод запускает выбранный бенчмарк."""
+        if options["rows"] < 1:
+            raise CommandError("Количество строк должно быть больше нуля.")
+        with override_settings(CACHES=NO_CACHE), transaction.atomic():
+            BENCHMARKS[options["name"]](options["rows"], self.stdout)
+            transaction.set_rollback(True)
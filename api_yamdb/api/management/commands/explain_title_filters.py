@@ -0,0 +1,64 @@
+from itertools import combinations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.filters import TitleFilter
+from api.views import TitleViewSet
+from reviews.models import Category, Genre
+
+SAMPLE_PARAMS = {
+    "category": "movie",
+    "genre": "drama",
+    "year": "2000",
+    "name": "Терминатор",
+    "search": "орешек",
+    "ordering": "-rating",
+}
+
+
+class Command(BaseCommand):
+    """Печать планов запросов списка произведений.
+
+    Для каждой комбинации параметров TitleFilter строится запрос
+    страницы списка, как в TitleViewSet, и выводится его план
+    (EXPLAIN QUERY PLAN на SQLite). Полный просмотр таблицы (SCAN)
+    вместо поиска по индексу (SEARCH) говорит о регрессии индексов.
+    Слаги жанра и категории берутся из БД: фильтр по несуществующему
+    слагу даёт заведомо пустой запрос, для которого нет плана.
+    """
+
+    help = "Планы запросов для комбинаций фильтров произведений."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--filters",
+            nargs="+",
+            choices=sorted(SAMPLE_PARAMS),
+            default=sorted(SAMPLE_PARAMS),
+            help="Фильтры, комбинации которых нужно проверить.",
+        )
+
+    def handle(self, *args, **options):
+        """Метод выводит план запроса для каждой комбинации фильтров."""
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        names = options["filters"]
+        samples = dict(SAMPLE_PARAMS)
+        for name, model in (("genre", Genre), ("category", Category)):
+            slug = model.objects.values_list("slug", flat=True).first()
+            if slug is not None:
+                samples[name] = slug
+        for size in range(len(names) + 1):
+            for combination in combinations(names, size):
+                params = {name: samples[name] for name in combination}
+                queryset = TitleFilter(
+                    params, queryset=TitleViewSet.queryset
+                ).qs[:page_size]
+                self.stdout.write(
+                    "Фильтры: " + (", ".join(combination) or "без фильтров")
+                )
+                if queryset.query.is_empty():
+                    self.stdout.write("  пустой результат, плана нет")
+                    continue
+                for line in queryset.explain().splitlines():
+                    self.stdout.write(f"  {line}")
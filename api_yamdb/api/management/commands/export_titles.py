@@ -0,0 +1,61 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import FORMATS, export_titles
+from api_yamdb.constants import EXPORT_CHUNK_SIZE
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    """Выгрузка всего каталога произведений в NDJSON или CSV.
+
+    Произведения читаются порциями (см. api.export), поэтому
+    память не зависит от размера каталога. Без --output выгрузка
+    пишется в стандартный вывод.
+    """
+
+    help = "Выгрузка каталога произведений в NDJSON или CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file-format",
+            choices=sorted(FORMATS),
+            default="ndjson",
+            help="Формат выгрузки.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Сжать выгрузку gzip.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help="Количество произведений, читаемых за один запрос.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Файл для выгрузки.",
+        )
+
+    def handle(self, *args, **options):
+        """Метод записывает выгрузку в файл или стандартный вывод."""
+        if options["chunk_size"] < 1:
+            raise CommandError("Размер порции должен быть больше нуля.")
+        chunks = export_titles(
+            Title.objects.all(),
+            options["file_format"],
+            options["chunk_size"],
+            gzip=options["gzip"],
+        )
+        if options["output"] is None:
+            self.write(sys.stdout.buffer, chunks)
+            return
+        with open(options["output"], "wb") as output:
+            self.write(output, chunks)
+
+    def write(self, output, chunks):
+        for chunk in chunks:
+            output.write(chunk)
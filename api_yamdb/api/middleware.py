@@ -0,0 +1,14 @@
+from .cache import remember_versions
+
+
+class CacheVersionsMiddleware:
+    """Версии данных читаются из БД один раз за запрос
+    (см. api.cache.remember_versions).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with remember_versions():
+            return self.get_response(request)
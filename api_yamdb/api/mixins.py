@@ -0,0 +1,234 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import http_date, parse_etags
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from .cache import get_last_modified, get_versions, record_cache_event
+
+
+class VersionScopesMixin:
+    """Базовый миксин представлений, ответы которых зависят
+    от версий областей данных (см. api.cache).
+    """
+
+    def get_list_version_scopes(self):
+        raise NotImplementedError
+
+    def get_detail_version_scopes(self):
+        raise NotImplementedError
+
+
+class ConditionalGetMixin(VersionScopesMixin):
+    """Базовый миксин условных GET-запросов.
+    ETag и Last-Modified вычисляются по версиям данных до выполнения
+    запроса к БД и сериализации, поэтому при совпадении
+    If-None-Match или If-Modified-Since сразу возвращается 304.
+    ETag выдаётся только успешным ответам, поэтому его совпадение
+    подтверждает, что ресурс существует. If-None-Match: * и условия
+    по дате подходят к любому URL, и перед ответом 304 вызывается
+    check: он проверяет ресурс и параметры запроса без сериализации
+    (или параметры проверяются до вызова get_conditional).
+    """
+
+    def get_etag(self, request, scopes):
+        renderer = getattr(request, "accepted_renderer", None)
+        digest = hashlib.md5(
+            ":".join(
+                (
+                    request.get_full_path(),
+                    getattr(renderer, "format", ""),
+                    ".".join(str(v) for v in get_versions(*scopes)),
+                )
+            ).encode()
+        ).hexdigest()
+        return f'"{digest}"'
+
+    def get_conditional(
+        self, request, scopes, handler, *args, check=None, **kwargs
+    ):
+        etag = self.get_etag(request, scopes)
+        last_modified = get_last_modified(*scopes)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if (
+            response is not None
+            and check is not None
+            and etag not in parse_etags(
+                request.META.get("HTTP_IF_NONE_MATCH", "")
+            )
+        ):
+            check(request, *args, **kwargs)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """Условные GET-запросы для действия list."""
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional(
+            request,
+            self.get_list_version_scopes(),
+            super().list,
+            *args,
+            check=self.check_list,
+            **kwargs,
+        )
+
+    def check_list(self, request, *args, **kwargs):
+        """Родитель из URL и фильтры проверяются без выполнения
+        запроса списка.
+        """
+        self.filter_queryset(self.get_queryset())
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """Условные GET-запросы для действия retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional(
+            request,
+            self.get_detail_version_scopes(),
+            super().retrieve,
+            *args,
+            check=self.check_object_exists,
+            **kwargs,
+        )
+
+    def check_object_exists(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        try:
+            exists = queryset.exists()
+        except (TypeError, ValueError, ValidationError):
+            exists = False
+        if not exists:
+            raise Http404
+
+
+class VersionedCacheMixin(VersionScopesMixin):
+    """Миксин кэширования ответов list и retrieve.
+    Ключ ответа строится из версий областей данных, которые
+    возвращают get_list_version_scopes и get_detail_version_scopes,
+    и нормализованных параметров запроса.
+    """
+
+    cache_name = None
+    cache_timeout = settings.API_CACHE_TIMEOUT
+
+    def get_cache_params(self, request):
+        """Возвращает параметры запроса, от которых зависит ответ.
+        None означает, что ответ кэшировать не нужно.
+        """
+        return {
+            key: request.query_params.getlist(key)
+            for key in request.query_params
+        }
+
+    def get_cache_key(self, request, scopes, params):
+        digest = hashlib.md5(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        versions = ".".join(str(version) for version in get_versions(*scopes))
+        return (
+            f"{self.cache_name}:{self.action}:{request.scheme}:"
+            f"{request.get_host()}:{versions}:{digest}"
+        )
+
+    def get_cached_response(self, request, scopes, handler, *args, **kwargs):
+        params = self.get_cache_params(request)
+        if params is None:
+            return handler(request, *args, **kwargs)
+        key = self.get_cache_key(request, scopes, params)
+        data = cache.get(key)
+        if data is not None:
+            record_cache_event(self.cache_name, "hits")
+            return Response(data)
+        record_cache_event(self.cache_name, "misses")
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request,
+            self.get_list_version_scopes(),
+            super().list,
+            *args,
+            **kwargs,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request,
+            self.get_detail_version_scopes(),
+            super().retrieve,
+            *args,
+            **kwargs,
+        )
+
+
+class ValuesListMixin:
+    """Миксин быстрого list: строки страницы выбираются через values()
+    и преобразуются в ответ сериализатором values_serializer_class
+    (см. api.serializers.ValuesSerializer).
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.values_serializer_class(
+            context=self.get_serializer_context()
+        )
+        rows = serializer.get_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(list(rows)))
+
+
+class ParentObjectMixin:
+    """Миксин вложенных маршрутов: родительский объект из URL
+    выбирается одним запросом один раз за запрос и хранится
+    в представлении. parent_lookup сопоставляет именам параметров
+    URL поля родителя; кроме первичного ключа в нём можно указать
+    поля, проверяющие принадлежность родителя (например, отзыва
+    произведению из URL). Другой способ выбора родителя задаётся
+    переопределением get_parent.
+    """
+
+    parent_queryset = None
+    parent_lookup = None
+
+    @cached_property
+    def parent(self):
+        return self.get_parent()
+
+    def get_parent(self):
+        return get_object_or_404(
+            self.parent_queryset,
+            **{
+                field: self.kwargs.get(kwarg)
+                for kwarg, field in self.parent_lookup.items()
+            },
+        )
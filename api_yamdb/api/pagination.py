@@ -0,0 +1,350 @@
+import base64
+import binascii
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import get_versions
+
+COUNT_KEY = "count:{versions}:{digest}"
+
+
+class KeysetPagination(BasePagination):
+    """Курсорная (keyset) пагинация по составному ключу.
+    Курсор хранит значения ключа сортировки последней выданной записи,
+    поэтому страница выбирается условием WHERE по индексу
+    без OFFSET и без COUNT(*). Последнее поле в `ordering`
+    должно быть уникальным.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Неверный курсор."
+
+    def __init__(self, ordering, page_size):
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip("-"))
+            for name in self.ordering
+        ]
+        # Строки values() должны содержать поля ключа курсора,
+        # даже если сериализатор их не выводит.
+        selected = getattr(queryset, "_fields", None)
+        if selected:
+            missing = [
+                field.attname
+                for field in self.fields
+                if field.attname not in selected
+            ]
+            if missing:
+                queryset = queryset.values(*selected, *missing)
+        reverse, values = self.decode_cursor(request)
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self.flip(name) for name in ordering)
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, values))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            has_next, has_previous = values is not None, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        self.next_key = (
+            self.get_key(results[-1]) if has_next and results else None
+        )
+        self.previous_key = (
+            self.get_key(results[0]) if has_previous and results else None
+        )
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self):
+        if self.next_key is None:
+            return None
+        return self.encode_cursor(False, self.next_key)
+
+    def get_previous_link(self):
+        if self.previous_key is None:
+            return None
+        return self.encode_cursor(True, self.previous_key)
+
+    @staticmethod
+    def flip(name):
+        return name[1:] if name.startswith("-") else f"-{name}"
+
+    def keyset_filter(self, ordering, values):
+        """Строит условие «строго после ключа» для сортировки ordering.
+        Для (-pub_date, -id) это pub_date < p OR (pub_date = p AND id < i).
+        """
+        conditions = []
+        for position, name in enumerate(ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            equal = {
+                field.attname: value
+                for field, value in zip(
+                    self.fields[:position], values[:position]
+                )
+            }
+            field = self.fields[position]
+            after = {f"{field.attname}__{lookup}": values[position]}
+            conditions.append(Q(**equal, **after))
+        # Избыточная граница по первому полю позволяет СУБД начать
+        # просмотр индекса сразу с нужной позиции.
+        first = self.fields[0]
+        lookup = "lte" if ordering[0].startswith("-") else "gte"
+        bound = Q(**{f"{first.attname}__{lookup}": values[0]})
+        return bound & reduce(or_, conditions)
+
+    def get_key(self, instance):
+        return [
+            field.value_from_object(instance)
+            if not isinstance(instance, dict)
+            else instance[field.attname]
+            for field in self.fields
+        ]
+
+    def encode_cursor(self, reverse, values):
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.make_cursor(reverse, values),
+        )
+
+    def make_cursor(self, reverse, values):
+        """Кодирует направление и значения ключа в строку курсора."""
+        payload = {
+            "r": int(reverse),
+            "k": [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in values
+            ],
+        }
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode()
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return False, None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            keys = payload["k"]
+            if len(keys) != len(self.fields) or None in keys:
+                raise ValueError
+            values = [
+                field.to_python(value)
+                for field, value in zip(self.fields, keys)
+            ]
+            return bool(payload["r"]), values
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class CountFreePageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация без COUNT(*) на каждой странице.
+    Страница выбирается с одной лишней записью, по которой
+    определяется наличие следующей. Общее количество записей
+    берётся из кэша: ключ включает версии областей данных
+    представления (get_count_version_scopes, а если его нет —
+    get_list_version_scopes) и SQL запроса, поэтому
+    COUNT(*) выполняется заново только после изменения данных.
+    На последней странице количество известно без подсчёта.
+    С параметром `?count=false` количество не выводится
+    (`?page=last` всё равно его определяет).
+    """
+
+    count_query_param = "count"
+    count_timeout = settings.API_CACHE_TIMEOUT
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        self.include_count = request.query_params.get(
+            self.count_query_param, ""
+        ).lower() not in ("0", "false")
+        self.count = None
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if page_number in self.last_page_strings:
+            self.count = self.get_count(queryset, view)
+            page_number = max(math.ceil(self.count / page_size), 1)
+        try:
+            page_number = int(page_number)
+            if page_number < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message)
+
+        offset = (page_number - 1) * page_size
+        results = list(queryset[offset: offset + page_size + 1])
+        if not results and page_number > 1:
+            raise NotFound(self.invalid_page_message)
+        self.page_number = page_number
+        self.has_next = len(results) > page_size
+        results = results[:page_size]
+        if self.include_count and self.count is None:
+            if self.has_next:
+                self.count = self.get_count(queryset, view)
+            else:
+                self.count = offset + len(results)
+                self.set_count(queryset, view, self.count)
+        return results
+
+    def get_count_key(self, queryset, view):
+        """Ключ количества записей или None, если у представления
+        нет версий данных и количество кэшировать нельзя.
+        """
+        scopes_getter = getattr(
+            view, "get_count_version_scopes", None
+        ) or getattr(view, "get_list_version_scopes", None)
+        if scopes_getter is None:
+            return None
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        digest = hashlib.md5(
+            json.dumps(
+                [queryset.model._meta.label, sql, params], default=str
+            ).encode()
+        ).hexdigest()
+        versions = ".".join(
+            str(version) for version in get_versions(*scopes_getter())
+        )
+        return COUNT_KEY.format(versions=versions, digest=digest)
+
+    def get_count(self, queryset, view):
+        key = self.get_count_key(queryset, view)
+        count = None if key is None else cache.get(key)
+        if count is None:
+            count = queryset.count()
+            if key is not None:
+                cache.set(key, count, self.count_timeout)
+        return count
+
+    def set_count(self, queryset, view, count):
+        key = self.get_count_key(queryset, view)
+        if key is not None:
+            cache.set(key, count, self.count_timeout)
+
+    def get_paginated_response(self, data):
+        items = [
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]
+        if self.include_count:
+            items.insert(0, ("count", self.count))
+        return Response(OrderedDict(items))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param,
+            self.page_number + 1,
+        )
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.page_number - 1
+        )
+
+
+class PageOrKeysetPagination(CountFreePageNumberPagination):
+    """Постраничная пагинация без подсчёта на каждой странице
+    (см. CountFreePageNumberPagination) с переключением на курсорную.
+    Курсорный режим включается параметром `?pagination=cursor`
+    или передачей `cursor`. Ключ сортировки задаётся атрибутом
+    `keyset_ordering` представления.
+    """
+
+    mode_query_param = "pagination"
+    cursor_mode = "cursor"
+
+    def use_keyset(self, request, view):
+        return getattr(view, "keyset_ordering", None) and (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if not self.use_keyset(request, view):
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset = KeysetPagination(
+            view.keyset_ordering, self.get_page_size(request)
+        )
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
+
+
+class KeysetOnlyPagination(PageOrKeysetPagination):
+    """Только курсорная пагинация по `keyset_ordering` представления:
+    для лент, которые читаются от новых записей к старым и где
+    номер страницы и общее количество не нужны.
+    """
+
+    def use_keyset(self, request, view):
+        return True
@@ -0,0 +1,180 @@
+"""Реестр жанров и категорий в памяти процесса.
+
+Жанров и категорий немного, а их слаги разрешаются при каждой записи
+произведения и при фильтрации списка. Реестр хранит отображение
+слаг → объект и перечитывает таблицу, когда меняется версия TAXONOMY
+(см. api.cache), поэтому изменения из других процессов тоже
+учитываются. В своём процессе реестр сбрасывается сигналами
+сохранения и удаления жанров и категорий (см. api.signals).
+
+Там же хранится индекс произведений по жанрам (GenreIndex) для
+фильтрации по нескольким жанрам сразу.
+"""
+import threading
+from functools import reduce
+from operator import and_, or_
+
+import numpy as np
+from django.db import connection
+from django.db.models import Max
+
+from reviews import genre_changes
+from reviews.models import Category, Genre, GenreTitle, GenreTitleChange
+from .cache import GENRE_LINKS, TAXONOMY, get_versions
+
+
+class SlugRegistry:
+    """Отображение слаг → объект для модели model."""
+
+    def __init__(self, model):
+        self.model = model
+        self.state = (None, {})
+        self.lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        # Поля сериализаторов копируются вместе с аргументами,
+        # а реестр должен оставаться общим.
+        return self
+
+    def fetch(self):
+        return {obj.slug: obj for obj in self.model.objects.all()}
+
+    def load(self):
+        # Внутри транзакции могут быть незафиксированные изменения,
+        # которые не должны попасть в общий реестр.
+        if connection.in_atomic_block:
+            return self.fetch()
+        (version,) = get_versions(TAXONOMY)
+        if self.state[0] != version:
+            with self.lock:
+                if self.state[0] != version:
+                    self.state = (version, self.fetch())
+        return self.state[1]
+
+    def get_many(self, slugs):
+        """Возвращает объекты по слагам. Слаги, которых нет в реестре,
+        ищутся в БД: реестр мог ещё не узнать о новом объекте.
+        """
+        objects = self.load()
+        found = {slug: objects[slug] for slug in slugs if slug in objects}
+        missing = set(slugs) - set(found)
+        if missing:
+            found.update(
+                self.model.objects.in_bulk(missing, field_name="slug")
+            )
+        return found
+
+    def get(self, slug):
+        return self.get_many((slug,)).get(slug)
+
+    def invalidate(self):
+        self.state = (None, {})
+
+
+class GenreIndex:
+    """Битовые карты произведений по жанрам: в карте жанра установлен
+    бит с номером id каждого его произведения. Пересечение
+    и объединение жанров — побитовые операции над целыми числами.
+    Карты строятся одним проходом по GenreTitle. Когда меняется
+    версия GENRE_LINKS (см. api.cache), к ним применяются новые записи
+    журнала GenreTitleChange (см. reviews.genre_changes): бит связи
+    устанавливается или сбрасывается. Карты перестраиваются целиком,
+    только если журнал не ведётся, уже прорежен дальше последней
+    применённой записи или в нём есть запись о перестройке.
+    """
+
+    def __init__(self):
+        self.state = (None, None, {})
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def to_bitmap(title_ids):
+        bits = np.zeros(max(title_ids) + 1, dtype=bool)
+        bits[title_ids] = True
+        return int.from_bytes(
+            np.packbits(bits, bitorder="little").tobytes(), "little"
+        )
+
+    def fetch(self):
+        """Возвращает id последней записи журнала и карты всех жанров.
+        Журнал читается раньше связей, поэтому записи после этого id
+        можно применять повторно: результат не изменится.
+        """
+        last_change_id = None
+        if genre_changes.is_supported(connection):
+            last_change_id = GenreTitleChange.objects.aggregate(
+                last=Max("id")
+            )["last"] or 0
+        title_ids = {}
+        links = GenreTitle.objects.values_list("genre_id", "title_id")
+        for genre_id, title_id in links.iterator():
+            title_ids.setdefault(genre_id, []).append(title_id)
+        return last_change_id, {
+            genre_id: self.to_bitmap(ids)
+            for genre_id, ids in title_ids.items()
+        }
+
+    @staticmethod
+    def apply_changes(last_change_id, bitmaps):
+        """Применяет к картам записи журнала после last_change_id.
+        Возвращает id последней записи и новые карты
+        или None, если карты нужно перестроить.
+        """
+        if last_change_id is None:
+            return None
+        changes = list(
+            GenreTitleChange.objects.filter(id__gt=last_change_id)
+            .order_by("id")
+            .values_list("id", "genre_id", "title_id", "added")
+        )
+        if not changes:
+            return last_change_id, bitmaps
+        if changes[0][0] != last_change_id + 1:
+            return None
+        bitmaps = dict(bitmaps)
+        for _, genre_id, title_id, added in changes:
+            if added is None:
+                return None
+            bitmap = bitmaps.get(genre_id, 0)
+            bit = 1 << title_id
+            bitmaps[genre_id] = bitmap | bit if added else bitmap & ~bit
+        return changes[-1][0], bitmaps
+
+    def load(self):
+        if connection.in_atomic_block:
+            return self.fetch()[1]
+        (version,) = get_versions(GENRE_LINKS)
+        if self.state[0] != version:
+            with self.lock:
+                if self.state[0] != version:
+                    _, last_change_id, bitmaps = self.state
+                    changed = self.apply_changes(last_change_id, bitmaps)
+                    self.state = (version, *(changed or self.fetch()))
+        return self.state[2]
+
+    def invalidate(self):
+        self.state = (None, None, {})
+
+    def match(self, genre_ids, match_all=True):
+        """Битовая карта произведений со всеми (match_all)
+        или хотя бы одним из жанров genre_ids.
+        """
+        bitmaps = self.load()
+        return reduce(
+            and_ if match_all else or_,
+            (bitmaps.get(genre_id, 0) for genre_id in genre_ids),
+        )
+
+    @staticmethod
+    def title_ids(bitmap):
+        """Список id произведений карты bitmap."""
+        data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+        bits = np.unpackbits(
+            np.frombuffer(data, dtype=np.uint8), bitorder="little"
+        )
+        return np.flatnonzero(bits).tolist()
+
+
+GENRES = SlugRegistry(Genre)
+CATEGORIES = SlugRegistry(Category)
+GENRE_INDEX = GenreIndex()
@@ -1,21 +1,43 @@
 import re
 from datetime import datetime
+from functools import partial
+from operator import itemgetter
 
 from django.core.validators import (
     MaxValueValidator,
     MinValueValidator,
 )
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 from rest_framework.serializers import IntegerField
-
+from rest_framework.settings import api_settings
+
+from api.cache import (
+    CATALOG,
+    GENRE_LINKS,
+    TITLES,
+    bump_versions,
+    title_scope,
+)
 from api.exeptions import ValidationDublicateNotError, ValidationNameError
+from api.registry import CATEGORIES, GENRES
 from api_yamdb.constants import (
+    BULK_MAX_SIZE,
     MAX_LENGTH_EMAIL_FIELD,
     MAX_LENGTH_USERNAME_FIELD,
     MAX_LENGTH_CONFIRMATION_CODE_FIELD,
 )
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (
+    SCORES,
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    score_count_field,
+)
 from users.models import CHOICES, User
 
 
@@ -35,19 +57,35 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ("name", "slug")
 
 
+class RegistrySlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который разрешает слаг по реестру в памяти
+    (см. api.registry) без запроса к БД.
+    """
+
+    def __init__(self, registry, **kwargs):
+        self.registry = registry
+        kwargs.setdefault("queryset", registry.model.objects.all())
+        super().__init__(slug_field="slug", **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("invalid")
+        obj = self.registry.get(data)
+        if obj is None:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=data)
+        return obj
+
+
 class TitleCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания или изменения объекта Title."""
 
-    genre = serializers.SlugRelatedField(
-        queryset=Genre.objects.all(),
-        slug_field="slug",
+    genre = RegistrySlugRelatedField(
+        GENRES,
         many=True,
         allow_null=False,
         allow_empty=False,
     )
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(), slug_field="slug"
-    )
+    category = RegistrySlugRelatedField(CATEGORIES)
     description = serializers.CharField(required=False, allow_blank=True)
 
     class Meta:
@@ -72,20 +110,65 @@ class TitleCreateSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def create(self, validated_data):
+        genres = validated_data.pop("genre")
+        title = Title.objects.create(**validated_data)
+        # У нового произведения нет связей с жанрами, поэтому add()
+        # без сравнения с текущими связями, которое выполняет set().
+        title.genre.add(*genres)
+        return title
+
+    def update(self, title, validated_data):
+        if "genre" not in validated_data:
+            # UpdateModelMixin сбрасывает кэш prefetch_related после
+            # сохранения, а жанры для ответа не изменились.
+            self.genres = list(title.genre.all())
+        return super().update(title, validated_data)
+
     def to_representation(self, title):
         """Метод изменяет сериализатор для отображение объекта Title.
-        Используется при формировании ответа на POSTили PATCH запрос."""
-        serializer = TitleSerializer(title)
-        return serializer.data
+        Используется при формировании ответа на POST или PATCH запрос.
+        Жанры и категория берутся из проверенных данных (см. api.registry),
+        рейтинг хранится в самом произведении, поэтому для ответа
+        дополнительные запросы к БД не нужны.
+        """
+        if "genre" in self.validated_data:
+            genres = sorted(
+                set(self.validated_data["genre"]), key=lambda genre: genre.pk
+            )
+        elif getattr(self, "genres", None) is not None:
+            genres = self.genres
+        else:
+            genres = title.genre.all()
+        fields = TitleSerializer(context=self.context).fields
+        data = {}
+        for name, field in fields.items():
+            value = genres if name == "genre" else field.get_attribute(title)
+            data[name] = (
+                None if value is None else field.to_representation(value)
+            )
+        return data
 
 
 class TitleSerializer(serializers.ModelSerializer):
-    """Сериализатор для отображения объекта Title."""
+    """Сериализатор для отображения объекта Title.
+    Число отзывов хранится в модели и выводится всегда, гистограмма
+    оценок — только если в контексте передан флаг include_histogram.
+    Список fields в контексте оставляет только перечисленные поля.
+    Если в контексте передан список expand, связи, не указанные в нём,
+    выводятся слагами, а не вложенными объектами.
+    """
+
+    expandable_fields = ("genre", "category")
 
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
     description = serializers.CharField(required=False, allow_blank=True)
     rating = serializers.IntegerField(read_only=True)
+    review_count = serializers.IntegerField(read_only=True)
+    score_histogram = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
 
     class Meta:
         model = Title
@@ -97,8 +180,214 @@ class TitleSerializer(serializers.ModelSerializer):
             "rating",
             "genre",
             "category",
+            "review_count",
+            "score_histogram",
         )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get("include_histogram"):
+            self.fields.pop("score_histogram")
+        fields = self.context.get("fields")
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        expand = self.context.get("expand")
+        if expand is not None:
+            for name in set(self.expandable_fields) - set(expand):
+                if name in self.fields:
+                    self.fields[name] = serializers.SlugRelatedField(
+                        slug_field="slug",
+                        many=isinstance(
+                            self.fields[name], serializers.ListSerializer
+                        ),
+                        read_only=True,
+                    )
+
+
+class TitleBulkListSerializer(serializers.ListSerializer):
+    """Массовое создание и изменение произведений.
+    Слаги жанров и категорий всех элементов разрешаются по реестру
+    в памяти (см. api.registry), произведения и связи с жанрами
+    записываются пакетно в одной транзакции. Ошибки возвращаются
+    списком по элементам.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list) and len(data) > BULK_MAX_SIZE:
+            raise serializers.ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        f"Не более {BULK_MAX_SIZE} произведений за запрос."
+                    ]
+                }
+            )
+        if not isinstance(data, list) or not data:
+            return super().to_internal_value(data)
+        items = []
+        errors = []
+        for item in data:
+            try:
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                items.append({})
+                errors.append(exc.detail)
+        genres = GENRES.get_many(
+            {slug for item in items for slug in item.get("genre", ())}
+        )
+        categories = CATEGORIES.get_many(
+            {item["category"] for item in items if "category" in item}
+        )
+        self.titles = {}
+        if self.instance is not None:
+            self.titles = self.instance.in_bulk(
+                {item["id"] for item in items if "id" in item}
+            )
+        seen = set()
+        for item, item_errors in zip(items, errors):
+            if not item_errors:
+                item_errors.update(
+                    self.resolve_item(item, genres, categories, seen)
+                )
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def resolve_item(self, item, genres, categories, seen):
+        """Заменяет слаги элемента объектами и возвращает его ошибки."""
+        errors = {}
+        if self.instance is not None:
+            title_id = item.get("id")
+            if title_id is None:
+                errors["id"] = ["Обязательное поле."]
+            elif title_id not in self.titles:
+                errors["id"] = [f"Произведение {title_id} не найдено."]
+            elif title_id in seen:
+                errors["id"] = [f"Произведение {title_id} указано дважды."]
+            seen.add(title_id)
+        if "genre" in item:
+            missing = [slug for slug in item["genre"] if slug not in genres]
+            if missing:
+                errors["genre"] = [
+                    f"Жанр {slug} не найден." for slug in missing
+                ]
+            else:
+                item["genre"] = [
+                    genres[slug] for slug in dict.fromkeys(item["genre"])
+                ]
+        if "category" in item:
+            if item["category"] in categories:
+                item["category"] = categories[item["category"]]
+            else:
+                errors["category"] = [
+                    f"Категория {item['category']} не найдена."
+                ]
+        return errors
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            titles = Title.objects.bulk_create(
+                Title(
+                    **{
+                        name: value
+                        for name, value in item.items()
+                        if name not in ("id", "genre")
+                    }
+                )
+                for item in validated_data
+            )
+            GenreTitle.objects.bulk_create(
+                GenreTitle(title=title, genre=genre)
+                for title, item in zip(titles, validated_data)
+                for genre in item["genre"]
+            )
+            # bulk_create не отправляет сигналы, версии кэша
+            # увеличиваются явно.
+            bump_versions(CATALOG, TITLES, GENRE_LINKS)
+        return titles
+
+    def update(self, queryset, validated_data):
+        titles = []
+        fields = set()
+        genres = {}
+        for item in validated_data:
+            title = self.titles[item["id"]]
+            for name, value in item.items():
+                if name == "genre":
+                    genres[title] = {genre.pk for genre in value}
+                elif name != "id":
+                    setattr(title, name, value)
+                    fields.add(name)
+            titles.append(title)
+        with transaction.atomic():
+            if fields:
+                Title.objects.bulk_update(titles, fields)
+            scopes = [
+                CATALOG,
+                TITLES,
+                *(title_scope(title.pk) for title in titles),
+            ]
+            if genres:
+                self.update_genres(genres)
+                scopes.append(GENRE_LINKS)
+            bump_versions(*scopes)
+        return titles
+
+    def update_genres(self, genres):
+        """Удаляет и добавляет только изменившиеся связи с жанрами."""
+        links = GenreTitle.objects.filter(title__in=genres).values_list(
+            "pk", "title_id", "genre_id"
+        )
+        existing = {}
+        removed = []
+        for pk, title_id, genre_id in links:
+            existing.setdefault(title_id, set()).add(genre_id)
+            if genre_id not in genres[self.titles[title_id]]:
+                removed.append(pk)
+        if removed:
+            GenreTitle.objects.filter(pk__in=removed).delete()
+        GenreTitle.objects.bulk_create(
+            GenreTitle(
+                title=title,
+                genre_id=genre_id,
+                weighted_rating=title.weighted_rating,
+            )
+            for title, genre_ids in genres.items()
+            for genre_id in genre_ids - existing.get(title.pk, set())
+        )
+
+    def to_representation(self, titles):
+        """Произведения выводятся через TitleSerializer в порядке запроса,
+        жанры и категории загружаются для всех сразу.
+        """
+        loaded = (
+            Title.objects.select_related("category")
+            .prefetch_related("genre")
+            .in_bulk([title.pk for title in titles])
+        )
+        return TitleSerializer(
+            [loaded[title.pk] for title in titles],
+            many=True,
+            context=self.context,
+        ).data
+
+
+class TitleBulkSerializer(TitleCreateSerializer):
+    """Элемент массового создания или изменения произведений.
+    Жанры и категория принимаются слагами и проверяются
+    сразу для всего списка (см. TitleBulkListSerializer).
+    """
+
+    id = serializers.IntegerField(required=False)
+    genre = serializers.ListField(
+        child=serializers.SlugField(), allow_empty=False
+    )
+    category = serializers.SlugField()
+
+    class Meta(TitleCreateSerializer.Meta):
+        list_serializer_class = TitleBulkListSerializer
+
 
 class ValidationUsernameMixin:
     """Миксин для проверки имени пользователя
@@ -248,7 +537,14 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ("id", "text", "author", "score", "pub_date")
+        fields = (
+            "id",
+            "text",
+            "author",
+            "score",
+            "pub_date",
+            "comment_count",
+        )
 
     def validate(self, data):
         """Разрешает добавлять пользователю только один отзыв."""
@@ -271,3 +567,183 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ("id", "text", "author", "pub_date")
+
+
+class AuthorReviewSerializer(ReviewSerializer):
+    """Отзыв в ленте активности автора, с id произведения."""
+
+    class Meta(ReviewSerializer.Meta):
+        fields = (*ReviewSerializer.Meta.fields, "title")
+        read_only_fields = ("title",)
+
+
+class AuthorCommentSerializer(CommentSerializer):
+    """Комментарий в ленте активности автора, с id отзыва
+    и произведения.
+    """
+
+    title = serializers.IntegerField(source="review.title_id", read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = (*CommentSerializer.Meta.fields, "review", "title")
+        read_only_fields = ("review",)
+
+
+def get_category(row):
+    if row["category__slug"] is None:
+        return None
+    return {"name": row["category__name"], "slug": row["category__slug"]}
+
+
+def get_rating(row):
+    # IntegerField в TitleSerializer отбрасывает дробную часть рейтинга.
+    return None if row["rating"] is None else int(row["rating"])
+
+
+def get_score_histogram(row):
+    return {str(score): row[score_count_field(score)] for score in SCORES}
+
+
+def get_title_genres(genres, row):
+    return genres[row["id"]]
+
+
+def get_field_value(field, source, row):
+    return field.to_representation(row[source])
+
+
+class ValuesSerializer:
+    """Быстрая сериализация списков.
+    Строки выбираются через values(), а словари ответа собираются
+    напрямую, без полей DRF для каждого объекта. Состав и порядок
+    полей берутся из serializer_class с тем же контекстом, поэтому
+    вывод совпадает с ним.
+    """
+
+    serializer_class = None
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.fields = self.serializer_class(context=self.context).fields
+
+    def get_values(self, queryset):
+        return queryset.prefetch_related(None).values(
+            *self.get_value_fields()
+        )
+
+    def get_value_fields(self):
+        raise NotImplementedError
+
+    def get_getters(self, rows):
+        """Возвращает пары (имя поля, функция от строки values())."""
+        raise NotImplementedError
+
+    def to_representation(self, rows):
+        getters = self.get_getters(rows)
+        return [
+            {name: getter(row) for name, getter in getters} for row in rows
+        ]
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    """Быстрая сериализация списка произведений (см. TitleSerializer).
+    Жанры страницы загружаются одним запросом.
+    """
+
+    serializer_class = TitleSerializer
+
+    def get_value_fields(self):
+        names = ["id"]
+        for name, field in self.fields.items():
+            if name == "category":
+                names.append("category__slug")
+                if isinstance(field, CategorySerializer):
+                    names.append("category__name")
+            elif name == "score_histogram":
+                names.extend(score_count_field(score) for score in SCORES)
+            elif name not in ("id", "genre"):
+                names.append(name)
+        return names
+
+    def get_genres(self, rows):
+        """Жанры произведений страницы в порядке, как при prefetch."""
+        nested = isinstance(self.fields["genre"], serializers.ListSerializer)
+        genres = {row["id"]: [] for row in rows}
+        if not genres:
+            return genres
+        links = (
+            GenreTitle.objects.filter(title_id__in=genres)
+            .order_by("genre_id")
+            .values_list("title_id", "genre__name", "genre__slug")
+        )
+        for title_id, name, slug in links:
+            genres[title_id].append(
+                {"name": name, "slug": slug} if nested else slug
+            )
+        return genres
+
+    def get_getters(self, rows):
+        getters = []
+        for name, field in self.fields.items():
+            if name == "genre":
+                getter = partial(get_title_genres, self.get_genres(rows))
+            elif name == "category":
+                getter = (
+                    get_category
+                    if isinstance(field, CategorySerializer)
+                    else itemgetter("category__slug")
+                )
+            elif name == "rating":
+                getter = get_rating
+            elif name == "score_histogram":
+                getter = get_score_histogram
+            else:
+                getter = itemgetter(name)
+            getters.append((name, getter))
+        return getters
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """Быстрая сериализация списка отзывов (см. ReviewSerializer).
+    Даты форматируются полем DateTimeField исходного сериализатора.
+    """
+
+    serializer_class = ReviewSerializer
+    sources = {"author": "author__username"}
+
+    def get_value_fields(self):
+        return [self.sources.get(name, name) for name in self.fields]
+
+    def get_getters(self, rows):
+        getters = []
+        for name, field in self.fields.items():
+            source = self.sources.get(name, name)
+            if isinstance(field, serializers.DateTimeField):
+                getter = partial(get_field_value, field, source)
+            else:
+                getter = itemgetter(source)
+            getters.append((name, getter))
+        return getters
+
+
+class CommentValuesSerializer(ReviewValuesSerializer):
+    """Быстрая сериализация списка комментариев (см. CommentSerializer)."""
+
+    serializer_class = CommentSerializer
+
+
+class AuthorReviewValuesSerializer(ReviewValuesSerializer):
+    """Быстрая сериализация ленты отзывов автора
+    (см. AuthorReviewSerializer).
+    """
+
+    serializer_class = AuthorReviewSerializer
+
+
+class AuthorCommentValuesSerializer(ReviewValuesSerializer):
+    """Быстрая сериализация ленты комментариев автора
+    (см. AuthorCommentSerializer).
+    """
+
+    serializer_class = AuthorCommentSerializer
+    sources = {**ReviewValuesSerializer.sources, "title": "review__title"}
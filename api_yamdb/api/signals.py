@@ -0,0 +1,173 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.signals import get_deletion, is_deleting
+from users.models import User
+from .cache import (
+    AUTHORS,
+    CATALOG,
+    GENRE_LINKS,
+    TAXONOMY,
+    TITLES,
+    USERS,
+    author_scope,
+    bump_versions,
+    review_scope,
+    title_scope,
+)
+from .registry import CATEGORIES, GENRES
+
+
+def bump_changed(signal, *scopes):
+    """bump_versions для обработчиков post_save и post_delete. При
+    удалении нескольких записей (каскадом или через QuerySet.delete)
+    области копятся и увеличиваются одним запросом после последней
+    записи.
+    """
+    deletion = get_deletion()
+    if signal is not post_delete or deletion is None:
+        bump_versions(*scopes)
+        return
+    deletion.deferred.update(scopes)
+    if deletion.finished:
+        bump_versions(*deletion.deferred)
+        deletion.deferred.clear()
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    bump_changed(kwargs["signal"], CATALOG, TITLES, title_scope(instance.pk))
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def invalidate_title_genre(sender, instance, **kwargs):
+    bump_changed(
+        kwargs["signal"],
+        CATALOG,
+        GENRE_LINKS,
+        title_scope(instance.title_id),
+    )
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    """Отзыв меняет рейтинг произведения, список его отзывов
+    и ленту активности автора.
+    """
+    scopes = [
+        CATALOG,
+        title_scope(instance.title_id),
+        review_scope(instance.pk),
+        author_scope(instance.author_id),
+    ]
+    previous = getattr(instance, "_previous", None)
+    if previous is not None and previous[0] != instance.title_id:
+        scopes.append(title_scope(previous[0]))
+        # В лентах комментаторов выводится произведение отзыва.
+        scopes.extend(
+            author_scope(author_id)
+            for author_id in Comment.objects.filter(review_id=instance.pk)
+            .values_list("author_id", flat=True)
+            .distinct()
+        )
+    bump_changed(kwargs["signal"], *scopes)
+
+
+def get_comment_title_id(comment):
+    """Произведение отзыва комментария, без запроса, если отзыв
+    уже загружен (как в CommentViewSet).
+    """
+    if Comment.review.is_cached(comment):
+        return comment.review.title_id
+    return (
+        Review.objects.filter(pk=comment.review_id)
+        .values_list("title_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    """Комментарий меняет счётчик комментариев отзыва, который
+    выводится и в списке отзывов произведения, и ленту активности
+    автора.
+    """
+    scopes = [
+        review_scope(instance.review_id),
+        author_scope(instance.author_id),
+    ]
+    # Отзыв, удаляемый вместе с комментарием, сам увеличит версию
+    # своего произведения.
+    if kwargs["signal"] is not post_delete or not is_deleting(
+        Review, instance.review_id
+    ):
+        scopes.append(title_scope(get_comment_title_id(instance)))
+    previous = getattr(instance, "_previous_review_id", None)
+    if previous is not None and previous != instance.review_id:
+        scopes.append(review_scope(previous))
+    bump_changed(kwargs["signal"], *scopes)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, pk_set, **kwargs):
+    """Связи добавляются через bulk_create без сигналов модели.
+    Удаляемые связи отправляют post_delete (invalidate_title_genre).
+    """
+    if action != "post_add":
+        return
+    if isinstance(instance, Title):
+        title_ids = [instance.pk]
+    else:
+        title_ids = pk_set or []
+    bump_versions(
+        CATALOG,
+        GENRE_LINKS,
+        *(title_scope(title_id) for title_id in title_ids),
+    )
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_taxonomy(sender, instance, **kwargs):
+    (GENRES if sender is Genre else CATEGORIES).invalidate()
+    bump_changed(kwargs["signal"], CATALOG, TAXONOMY)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._previous_username = None
+    if instance.pk is not None and not kwargs.get("raw"):
+        instance._previous_username = (
+            User.objects.filter(pk=instance.pk)
+            .values_list("username", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_name(sender, instance, created, **kwargs):
+    """Имя автора выводится в отзывах и комментариях."""
+    previous = getattr(instance, "_previous_username", None)
+    if not created and previous is not None and (
+        previous != instance.username
+    ):
+        bump_versions(AUTHORS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_users(sender, instance, **kwargs):
+    """Список пользователей (и его количество в пагинации)."""
+    bump_changed(kwargs["signal"], USERS)
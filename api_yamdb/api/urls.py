@@ -2,10 +2,13 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
+    AuthorCommentViewSet,
+    AuthorReviewViewSet,
     CategoryViewSet,
     CommentViewSet,
     GenreViewSet,
     GetTokenView,
+    LatestReviewsViewSet,
     ReviewViewSet,
     SignUpView,
     TitleViewSet,
@@ -18,6 +21,17 @@ router_v1.register("titles", TitleViewSet)
 router_v1.register("genres", GenreViewSet)
 router_v1.register("categories", CategoryViewSet)
 router_v1.register("users", UserViewSet)
+router_v1.register(
+    r"users/(?P<username>[\w.@+-]+)/reviews",
+    AuthorReviewViewSet,
+    basename="author-reviews",
+)
+router_v1.register(
+    r"users/(?P<username>[\w.@+-]+)/comments",
+    AuthorCommentViewSet,
+    basename="author-comments",
+)
+router_v1.register("reviews", LatestReviewsViewSet, basename="latest-reviews")
 router_v1.register(
     r"titles/(?P<title_id>\d+)/reviews", ReviewViewSet, basename="reviews"
 )
@@ -1,7 +1,9 @@
 from http import HTTPStatus
 
-from django.db.models import Avg
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (
     filters,
@@ -11,28 +13,65 @@ from rest_framework import (
     viewsets,
 )
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotAuthenticated, ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from reviews.models import Category, Genre, Review, Title
+from api_yamdb.constants import (
+    EXPORT_CHUNK_SIZE,
+    LEADERBOARD_MAX_SIZE,
+    LEADERBOARD_SIZE,
+    REVIEW_BATCH_MAX_PER_TITLE,
+    REVIEW_BATCH_MAX_TITLES,
+    REVIEW_BATCH_PER_TITLE,
+)
+from reviews.models import Category, Genre, Review, SimilarTitle, Title
 from users.models import User
+from .cache import (
+    AUTHORS,
+    CATALOG,
+    GENRE_LINKS,
+    TAXONOMY,
+    TITLES,
+    USERS,
+    author_scope,
+    get_cache_stats,
+    review_scope,
+    title_scope,
+)
+from .export import FORMATS, export_titles, get_filename
 from .filters import TitleFilter
+from .mixins import (
+    ConditionalGetMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    ParentObjectMixin,
+    ValuesListMixin,
+    VersionedCacheMixin,
+)
+from .pagination import KeysetOnlyPagination, PageOrKeysetPagination
 from .permissions import (
     IsAdminOrDeny,
     IsAdminOrReadOnly,
     ReviewCommentPermissions,
 )
 from .serializers import (
+    AuthorCommentValuesSerializer,
+    AuthorReviewValuesSerializer,
     CategorySerializer,
     CommentSerializer,
+    CommentValuesSerializer,
     GenreSerializer,
     GetTokenSerializer,
     ReviewSerializer,
+    ReviewValuesSerializer,
     SignUpSerializer,
+    TitleBulkSerializer,
     TitleCreateSerializer,
     TitleSerializer,
+    TitleValuesSerializer,
     UserGetMeSerializer,
     UserGetUsernameSerializer,
     UserSerializer,
@@ -44,32 +83,317 @@ from .service import (
 )
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    """ViewSet для работы с моделью Titles."""
+# Поля, которые читают сериализаторы, права доступа и сигналы.
+REVIEW_FIELDS = (
+    "text",
+    "score",
+    "pub_date",
+    "title",
+    "author",
+)
+COMMENT_FIELDS = ("text", "pub_date", "review", "author")
+
+
+class TitleViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    VersionedCacheMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
+    """ViewSet для работы с моделью Titles.
+    Ответы list и retrieve кэшируются с учётом версий каталога,
+    список сериализуется через values() (TitleValuesSerializer).
+    """
 
     queryset = (
-        Title.objects.all()
-        .annotate(rating=Avg("reviews__score"))
-        .order_by("id",)
+        Title.objects.select_related("category")
+        .prefetch_related("genre")
+        .order_by("id")
     )
     serializer_class = TitleSerializer
+    values_serializer_class = TitleValuesSerializer
     permission_classes = (IsAdminOrReadOnly,)
     http_method_names = ["get", "post", "patch", "delete"]
-    pagination_class = PageNumberPagination
+    pagination_class = PageOrKeysetPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    cache_name = "titles"
+
+    @property
+    def keyset_ordering(self):
+        """Ключ курсорной пагинации следует сортировке ?ordering=.
+        Рейтинг бывает пустым и не может быть ключом курсора,
+        поэтому при сортировке по рейтингу пагинация постраничная.
+        Результаты поиска без ?ordering= упорядочены по релевантности,
+        которая не хранится в модели, и тоже листаются постранично.
+        """
+        ordering = self.request.query_params.get("ordering")
+        if not ordering:
+            if self.request.query_params.get("search", "").strip():
+                return None
+            return ("id",)
+        if ordering.lstrip("-") == "rating":
+            return None
+        return (ordering, "-id" if ordering[0] == "-" else "id")
+
+    def get_list_version_scopes(self):
+        return (CATALOG, TAXONOMY)
+
+    def get_count_version_scopes(self):
+        """Количество произведений зависит только от их состава,
+        связей с жанрами и категорий, но не от отзывов.
+        """
+        return (TITLES, GENRE_LINKS, TAXONOMY)
+
+    def get_detail_version_scopes(self):
+        return (title_scope(self.kwargs[self.lookup_field]), TAXONOMY)
+
+    def get_cache_params(self, request):
+        """Нормализует параметры фильтра TitleFilter и пагинации."""
+        filterset = self.filterset_class(
+            request.query_params, queryset=self.queryset
+        )
+        if not filterset.is_valid():
+            return None
+        params = {
+            name: value
+            for name, value in filterset.form.cleaned_data.items()
+            if value not in (None, "")
+        }
+        params.update(
+            (key, request.query_params.getlist(key))
+            for key in request.query_params
+            if key not in filterset.filters
+        )
+        params["fields"], params["expand"] = self.get_fieldset()
+        return params
+
+    def get_fieldset(self):
+        """Разбирает параметры ?fields= и ?expand= (имена через запятую).
+        Возвращает пару отсортированных списков имён полей,
+        None вместо списка означает, что параметр не передан.
+        """
+        fieldset = []
+        for param, allowed in (
+            ("fields", TitleSerializer.Meta.fields),
+            ("expand", TitleSerializer.expandable_fields),
+        ):
+            value = self.request.query_params.get(param)
+            if value is None:
+                fieldset.append(None)
+                continue
+            names = {name.strip() for name in value.split(",")} - {""}
+            unknown = names - set(allowed)
+            if unknown:
+                raise ValidationError(
+                    {
+                        param: (
+                            f"Неизвестные поля: {', '.join(sorted(unknown))}."
+                            f" Допустимые поля: {', '.join(allowed)}."
+                        )
+                    }
+                )
+            fieldset.append(sorted(names))
+        return fieldset
+
+    def get_queryset(self):
+        """Для list и retrieve запрос сокращается под ?fields= и ?expand=:
+        невыводимые связи не загружаются, для связей, выводимых слагами,
+        загружается только слаг, невыводимые текстовые поля откладываются.
+        """
+        queryset = super().get_queryset()
+        if self.action not in ("list", "retrieve"):
+            return queryset
+        fields, expand = self.get_fieldset()
+        if fields is None and expand is None:
+            return queryset
+        requested = set(
+            TitleSerializer.Meta.fields if fields is None else fields
+        )
+        expanded = set(
+            TitleSerializer.expandable_fields if expand is None else expand
+        )
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if "genre" in requested:
+            queryset = queryset.prefetch_related(
+                "genre"
+                if "genre" in expanded
+                else Prefetch("genre", queryset=Genre.objects.only("slug"))
+            )
+        if "category" in requested:
+            queryset = queryset.select_related("category")
+            if "category" not in expanded:
+                queryset = queryset.defer("category__name")
+        return queryset.defer(
+            *(
+                name
+                for name in ("name", "description")
+                if name not in requested
+            )
+        )
+
+    @action(detail=False, url_path="top")
+    def top(self, request):
+        """Лучшие произведения по взвешенному рейтингу: в целом,
+        в категории (?category=) и/или жанре (?genre=).
+        """
+        return self.get_cached_response(
+            request, (CATALOG, TAXONOMY), self.get_top_response
+        )
+
+    def get_top_response(self, request):
+        titles = (
+            Title.objects.top_rated(
+                self.get_leaderboard_limit(request),
+                category=request.query_params.get("category"),
+                genre=request.query_params.get("genre"),
+            )
+            .select_related("category")
+            .prefetch_related("genre")
+        )
+        serializer = TitleSerializer(titles, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, url_path="trending")
+    def trending(self, request):
+        """Произведения с наибольшей недавней активностью: суммой
+        оценок отзывов, затухающей с давностью публикации
+        (см. reviews.models.TrendingEpoch).
+        """
+        return self.get_cached_response(
+            request, (CATALOG, TAXONOMY), self.get_trending_response
+        )
+
+    def get_trending_response(self, request):
+        titles = (
+            Title.objects.trending(self.get_leaderboard_limit(request))
+            .select_related("category")
+            .prefetch_related("genre")
+        )
+        serializer = TitleSerializer(titles, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, url_path="similar")
+    def similar(self, request, pk=None):
+        """Похожие произведения по жанрам и оценкам общих рецензентов.
+        Список рассчитывается командой compute_similar_titles
+        (см. reviews.similarity) и читается по индексу.
+        """
+        get_object_or_404(Title.objects.only("pk"), pk=pk)
+        links = (
+            SimilarTitle.objects.filter(title_id=pk)
+            .order_by("-score", "similar_id")
+            .select_related("similar__category")
+            .prefetch_related("similar__genre")
+        )
+        serializer = TitleSerializer(
+            [link.similar for link in links], many=True
+        )
+        return Response(serializer.data)
+
+    def get_leaderboard_limit(self, request):
+        limit = request.query_params.get("limit", LEADERBOARD_SIZE)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if not 1 <= limit <= LEADERBOARD_MAX_SIZE:
+            raise ValidationError(
+                {
+                    "limit": (
+                        f"Укажите число от 1 до {LEADERBOARD_MAX_SIZE}."
+                    )
+                }
+            )
+        return limit
+
+    @action(detail=False, methods=["post", "patch"], url_path="bulk")
+    def bulk(self, request):
+        """Массовое создание (POST) и изменение (PATCH) произведений.
+        Принимает список объектов; при изменении каждый объект
+        должен содержать id произведения.
+        """
+        partial = request.method == "PATCH"
+        serializer = self.get_serializer(
+            Title.objects.all() if partial else None,
+            data=request.data,
+            many=True,
+            partial=partial,
+            allow_empty=False,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(
+            serializer.data,
+            status=status.HTTP_200_OK if partial else status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, url_path="export")
+    def export(self, request):
+        """Потоковая выгрузка произведений с учётом фильтров TitleFilter.
+        Формат задаётся параметром ?file_format=ndjson|csv,
+        сжатие gzip — параметром ?gzip=true.
+        """
+        file_format = request.query_params.get("file_format", "ndjson")
+        if file_format not in FORMATS:
+            raise ValidationError(
+                {
+                    "file_format": (
+                        f"Допустимые форматы: {', '.join(FORMATS)}."
+                    )
+                }
+            )
+        gzip = request.query_params.get("gzip", "").lower() in ("1", "true")
+        response = StreamingHttpResponse(
+            export_titles(
+                self.filter_queryset(self.get_queryset()),
+                file_format,
+                EXPORT_CHUNK_SIZE,
+                gzip=gzip,
+            ),
+            content_type="application/gzip" if gzip else FORMATS[file_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{get_filename(file_format, gzip)}"'
+        )
+        return response
+
+    @action(
+        detail=False,
+        url_path="cache-stats",
+        permission_classes=(IsAdminOrDeny,),
+    )
+    def cache_stats(self, request):
+        """Статистика попаданий и промахов кэша каталога."""
+        return Response(get_cache_stats(self.cache_name))
+
+    def get_serializer_context(self):
+        """Гистограмма оценок выводится по параметру ?histogram=true,
+        состав полей задаётся параметрами ?fields= и ?expand=.
+        """
+        context = super().get_serializer_context()
+        context["include_histogram"] = self.request.query_params.get(
+            "histogram", ""
+        ).lower() in ("1", "true")
+        context["fields"], context["expand"] = self.get_fieldset()
+        return context
 
     def get_serializer_class(self):
         """Метод определяет, какой сериализатор использовать.
         TitleSerializer для операций 'list' и 'retrieve'.
         TitleCreateSerializer для других действий (например, 'create').
+        TitleBulkSerializer для массовых операций 'bulk'.
         """
         if self.action in ("list", "retrieve"):
             return TitleSerializer
+        if self.action == "bulk":
+            return TitleBulkSerializer
         return TitleCreateSerializer
 
 
 class BaseSlugViewSet(
+    ConditionalListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -82,6 +406,9 @@ class BaseSlugViewSet(
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
 
+    def get_list_version_scopes(self):
+        return (TAXONOMY,)
+
     def destroy(self, request, slug):
         instance = get_object_or_404(self.queryset, slug=slug)
         instance.delete()
@@ -105,12 +432,17 @@ class CategoryViewSet(BaseSlugViewSet):
 class UserViewSet(viewsets.ModelViewSet):
     """ViewSet для работы с моделью User."""
     http_method_names = ["get", "post", "patch", "delete"]
-    queryset = User.objects.all()
+    queryset = User.objects.all().order_by("id")
     permission_classes = (IsAdminOrDeny,)
+    pagination_class = PageOrKeysetPagination
+    keyset_ordering = ("id",)
     serializer_class = UserSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ["username"]
 
+    def get_list_version_scopes(self):
+        return (USERS,)
+
     @action(
         methods=["get", "patch"],
         detail=False,
@@ -193,35 +525,207 @@ class GetTokenView(APIView):
             return Response(token, status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    ParentObjectMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     """ViewSet для работы с моделью Review."""
 
     http_method_names = ["get", "post", "patch", "delete"]
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     permission_classes = (ReviewCommentPermissions,)
+    pagination_class = PageOrKeysetPagination
+    keyset_ordering = ("-pub_date", "-id")
+    parent_queryset = Title.objects.only("pk")
+    parent_lookup = {"title_id": "pk"}
 
-    def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get("title_id"))
+    def get_list_version_scopes(self):
+        return (title_scope(self.kwargs.get("title_id")), AUTHORS)
+
+    def get_detail_version_scopes(self):
+        return (review_scope(self.kwargs.get("pk")), AUTHORS)
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        """Имя автора выбирается в том же запросе, что и отзыв.
+        Счётчик комментариев читается, только если отзыв выводится
+        в ответе.
+        """
+        fields = (*REVIEW_FIELDS, "author__username")
+        if self.action != "destroy":
+            fields += ("comment_count",)
+        return self.parent.reviews.select_related("author").only(*fields)
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        serializer.save(author=self.request.user, title=self.parent)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
-    """ViewSet для работы с моделью Comment."""
+class LatestReviewsViewSet(ConditionalGetMixin, viewsets.GenericViewSet):
+    """Последние отзывы нескольких произведений одним запросом:
+    /reviews/?title_ids=1,2,3&per_title=3. Ответ — словарь
+    id произведения → до per_title отзывов в формате ReviewSerializer,
+    от новых к старым; для произведений без отзывов список пуст.
+    Отзывы выбираются одним запросом с ROW_NUMBER()
+    (см. ReviewQuerySet.latest_per_title).
+    """
+
+    http_method_names = ["get"]
+    queryset = Review.objects.all()
+    serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
+    permission_classes = (ReviewCommentPermissions,)
+    pagination_class = None
+
+    @cached_property
+    def title_ids(self):
+        raw = self.request.query_params.get("title_ids", "")
+        values = [value.strip() for value in raw.split(",")]
+        title_ids = []
+        if all(value.isdigit() for value in values):
+            title_ids = list(dict.fromkeys(int(value) for value in values))
+        if not 1 <= len(title_ids) <= REVIEW_BATCH_MAX_TITLES:
+            raise ValidationError(
+                {
+                    "title_ids": (
+                        f"Укажите через запятую от 1 до "
+                        f"{REVIEW_BATCH_MAX_TITLES} id произведений."
+                    )
+                }
+            )
+        return title_ids
+
+    @cached_property
+    def per_title(self):
+        per_title = self.request.query_params.get(
+            "per_title", REVIEW_BATCH_PER_TITLE
+        )
+        try:
+            per_title = int(per_title)
+        except (TypeError, ValueError):
+            per_title = 0
+        if not 1 <= per_title <= REVIEW_BATCH_MAX_PER_TITLE:
+            raise ValidationError(
+                {
+                    "per_title": (
+                        f"Укажите число от 1 до {REVIEW_BATCH_MAX_PER_TITLE}."
+                    )
+                }
+            )
+        return per_title
+
+    def get_list_version_scopes(self):
+        return (
+            *(title_scope(title_id) for title_id in self.title_ids),
+            AUTHORS,
+        )
+
+    def list(self, request, *args, **kwargs):
+        # Параметры проверяются до условного ответа 304: title_ids
+        # при вычислении областей данных, per_title — явно.
+        self.per_title
+        return self.get_conditional(
+            request, self.get_list_version_scopes(), self.get_latest_response
+        )
+
+    def get_latest_response(self, request):
+        serializer = self.values_serializer_class(
+            context=self.get_serializer_context()
+        )
+        rows = list(
+            self.get_queryset()
+            .filter(title_id__in=self.title_ids)
+            .latest_per_title(self.per_title)
+            .order_by("title_id", "-pub_date", "-id")
+            .values(*serializer.get_value_fields(), "title_id")
+        )
+        reviews = {title_id: [] for title_id in self.title_ids}
+        for row, review in zip(rows, serializer.to_representation(rows)):
+            reviews[row["title_id"]].append(review)
+        return Response(reviews)
+
+
+class CommentViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    ParentObjectMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
+    """ViewSet для работы с моделью Comment.
+    Отзыв из URL должен относиться к произведению из URL.
+    """
 
     http_method_names = ["get", "post", "patch", "delete"]
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     permission_classes = (ReviewCommentPermissions,)
+    pagination_class = PageOrKeysetPagination
+    keyset_ordering = ("-pub_date", "-id")
+    parent_queryset = Review.objects.only("pk", "title_id")
+    parent_lookup = {"review_id": "pk", "title_id": "title_id"}
 
-    def get_review(self):
-        return get_object_or_404(Review, pk=self.kwargs.get("review_id"))
+    def get_list_version_scopes(self):
+        return (review_scope(self.kwargs.get("review_id")), AUTHORS)
+
+    def get_detail_version_scopes(self):
+        return self.get_list_version_scopes()
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        """Имя автора выбирается в том же запросе, что и комментарий."""
+        return self.parent.comments.select_related("author").only(
+            *COMMENT_FIELDS, "author__username"
+        )
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(author=self.request.user, review=self.parent)
+
+
+class BaseAuthorFeedViewSet(
+    ConditionalListMixin,
+    ParentObjectMixin,
+    ValuesListMixin,
+    viewsets.GenericViewSet,
+):
+    """Базовый ViewSet ленты активности автора: записи от новых
+    к старым с курсорной пагинацией по индексу (author, -pub_date, -id).
+    Вместо имени пользователя в URL можно указать `me`.
+    """
+
+    http_method_names = ["get"]
+    permission_classes = (ReviewCommentPermissions,)
+    pagination_class = KeysetOnlyPagination
+    keyset_ordering = ("-pub_date", "-id")
+    parent_queryset = User.objects.only("pk", "username")
+    parent_lookup = {"username": "username"}
+    current_user_alias = "me"
+
+    def get_parent(self):
+        if self.kwargs.get("username") != self.current_user_alias:
+            return super().get_parent()
+        if not self.request.user.is_authenticated:
+            raise NotAuthenticated()
+        return self.request.user
+
+    def get_list_version_scopes(self):
+        return (author_scope(self.parent.pk), AUTHORS)
+
+
+class AuthorReviewViewSet(BaseAuthorFeedViewSet):
+    """Лента отзывов автора."""
+
+    values_serializer_class = AuthorReviewValuesSerializer
+
+    def get_queryset(self):
+        return self.parent.reviews.all()
+
+
+class AuthorCommentViewSet(BaseAuthorFeedViewSet):
+    """Лента комментариев автора."""
+
+    values_serializer_class = AuthorCommentValuesSerializer
+
+    def get_queryset(self):
+        return self.parent.comments.all()
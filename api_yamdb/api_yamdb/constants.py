@@ -3,3 +3,22 @@ MAX_LENGTH_USERNAME_FIELD = 150
 MAX_LENGTH_CONFIRMATION_CODE_FIELD = 255
 MAX_LENGTH_NAME = 256
 MAX_LENGTH_SLUG = 50
+RATING_PRIOR_MEAN = 5.5
+RATING_PRIOR_WEIGHT = 10
+LEADERBOARD_SIZE = 20
+LEADERBOARD_MAX_SIZE = 100
+MIN_SCORE = 1
+MAX_SCORE = 10
+BULK_MAX_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+GENRE_FILTER_MAX_IDS = 900
+TRENDING_HALF_LIFE = 7 * 24 * 60 * 60
+TRENDING_DEFAULT_EPOCH = 1704067200
+SIMILAR_TITLES_SIZE = 10
+SIMILAR_GENRE_WEIGHT = 0.5
+SIMILAR_MEMORY_BUDGET = 256 * 1024 * 1024
+REVIEW_BATCH_PER_TITLE = 3
+REVIEW_BATCH_MAX_PER_TITLE = 20
+REVIEW_BATCH_MAX_TITLES = 100
+GENRE_CHANGES_KEEP = 10000
+GENRE_CHANGES_PRUNE_EVERY = 1000
@@ -38,6 +38,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.CacheVersionsMiddleware",
 ]
 
 ROOT_URLCONF = "api_yamdb.urls"
@@ -69,6 +70,18 @@ DATABASES = {
     }
 }
 
+# Версии данных хранятся в БД (api.cache), а ключи ответов, количеств,
+# реестры слагов и индекс жанров сверяются с ними, поэтому кэш может
+# быть локальным для процесса.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
+API_CACHE_TIMEOUT = 300
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -13,8 +13,9 @@ class ReviewAdmin(admin.ModelAdmin):
         "pub_date",
         "title",
     )
-    list_filter = ("author", "score", "pub_date")
-    search_fields = ("author",)
+    list_select_related = ("author", "title")
+    list_filter = ("score", "pub_date")
+    search_fields = ("=author__username",)
 
 
 @admin.register(Comment)
@@ -26,8 +27,9 @@ class CommentAdmin(admin.ModelAdmin):
         "pub_date",
         "review",
     )
-    list_filter = ("author", "pub_date")
-    search_fields = ("author",)
+    list_select_related = ("author", "review")
+    list_filter = ("pub_date",)
+    search_fields = ("=author__username",)
 
 
 @admin.register(Category)
@@ -1,7 +1,27 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def repair_title_search(sender, using, **kwargs):
+    from .search import install
+
+    install(connections[using], repair=True)
+
+
+def repair_genre_changes(sender, using, **kwargs):
+    from .genre_changes import install
+
+    install(connections[using])
 
 
 class ReviewsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "reviews"
     verbose_name = "Отзывы на произведения"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(repair_title_search, sender=self)
+        post_migrate.connect(repair_genre_changes, sender=self)
@@ -0,0 +1,82 @@
+"""Журнал изменений связей жанров и произведений.
+
+На SQLite записи в таблицу GenreTitleChange добавляют триггеры
+на таблице связей, поэтому журнал учитывает и массовые операции
+(bulk_create, удаление каскадом). Триггер на самом журнале
+периодически удаляет записи старше последних GENRE_CHANGES_KEEP.
+На других СУБД журнал не ведётся, и индекс жанров перестраивается
+целиком.
+"""
+from django.db import connection
+
+from api_yamdb.constants import GENRE_CHANGES_KEEP, GENRE_CHANGES_PRUNE_EVERY
+
+CHANGE_TABLE = "reviews_genretitlechange"
+LINK_TABLE = "reviews_genretitle"
+
+
+def log_change(row, added):
+    return (
+        f"INSERT INTO {CHANGE_TABLE}(genre_id, title_id, added) "
+        f"VALUES ({row}.genre_id, {row}.title_id, {added});"
+    )
+
+
+TRIGGERS = {
+    f"{CHANGE_TABLE}_ai": (
+        f"AFTER INSERT ON {LINK_TABLE} BEGIN {log_change('new', 1)} END"
+    ),
+    f"{CHANGE_TABLE}_ad": (
+        f"AFTER DELETE ON {LINK_TABLE} BEGIN {log_change('old', 0)} END"
+    ),
+    f"{CHANGE_TABLE}_au": (
+        f"AFTER UPDATE OF genre_id, title_id ON {LINK_TABLE} "
+        f"BEGIN {log_change('old', 0)} {log_change('new', 1)} END"
+    ),
+    f"{CHANGE_TABLE}_prune": (
+        f"AFTER INSERT ON {CHANGE_TABLE} "
+        f"WHEN new.id % {GENRE_CHANGES_PRUNE_EVERY} = 0 "
+        f"BEGIN DELETE FROM {CHANGE_TABLE} "
+        f"WHERE id <= new.id - {GENRE_CHANGES_KEEP}; END"
+    ),
+}
+RESET = (
+    f"INSERT INTO {CHANGE_TABLE}(genre_id, title_id, added) "
+    "VALUES (0, 0, NULL)"
+)
+
+
+def is_supported(using=connection):
+    return using.vendor == "sqlite"
+
+
+def install(using=connection):
+    """Создаёт недостающие триггеры журнала, если таблица журнала
+    уже создана. Пересоздание таблицы связей миграциями SQLite
+    удаляет триггеры, поэтому функция вызывается и после каждой
+    миграции. Пока триггеров не было, связи могли измениться,
+    поэтому в журнал добавляется запись о перестройке индекса.
+    """
+    if not is_supported(using):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type IN ('table', 'trigger') AND name LIKE %s",
+            (f"{CHANGE_TABLE}%",),
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in TRIGGERS if name not in existing]
+        if not missing or CHANGE_TABLE not in existing:
+            return
+        for name in missing:
+            cursor.execute(f"CREATE TRIGGER {name} {TRIGGERS[name]}")
+        cursor.execute(RESET)
+
+
+def uninstall(using=connection):
+    if not is_supported(using):
+        return
+    with using.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api_yamdb.constants import SIMILAR_TITLES_SIZE
+from reviews.similarity import compute_similar_titles
+
+
+class Command(BaseCommand):
+    """Пакетный расчёт похожих произведений.
+
+    Отзывы и связи с жанрами загружаются в разреженные матрицы,
+    для каждого произведения сохраняются лучшие соседи по сходству
+    (см. reviews.similarity). Команду запускают по расписанию:
+    новые произведения и отзывы учитываются при следующем расчёте.
+    """
+
+    help = "Расчёт похожих произведений."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=SIMILAR_TITLES_SIZE,
+            help="Количество похожих произведений для каждого.",
+        )
+
+    def handle(self, *args, **options):
+        """Метод пересчитывает таблицу похожих произведений."""
+        if options["limit"] < 1:
+            raise CommandError("Количество должно быть больше нуля.")
+        stored = compute_similar_titles(options["limit"])
+        self.stdout.write(f"Сохранено пар похожих произведений: {stored}")
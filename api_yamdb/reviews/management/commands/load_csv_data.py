@@ -2,7 +2,15 @@ import csv
 import os
 
 from django.core.management.base import BaseCommand
-from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.models import (
+    CacheVersion,
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+)
 from users.models import CustomUser
 
 TABLES_AND_FILES = {
@@ -69,4 +77,11 @@ class Command(BaseCommand):
                     objects.append(object_instance)
 
                 model.objects.bulk_create(objects)
+
+        Title.objects.all().rebuild_ratings()
+        Title.objects.all().rebuild_trending()
+        Review.objects.all().rebuild_comment_counts()
+        # bulk_create не отправляет сигналы: увеличиваются версии
+        # всех областей данных кэша ответов API.
+        CacheVersion.bump_all()
         return "Данные из csv файлов успешно загружены."
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import CacheVersion, Review, Title
+
+
+class Command(BaseCommand):
+    """Пересчёт хранимого рейтинга произведений.
+
+    Сумма оценок, количество отзывов, рейтинг и взвешенный рейтинг
+    каждого произведения вычисляются заново по таблице отзывов,
+    количество комментариев отзывов — по таблице комментариев.
+    """
+
+    help = "Пересчёт рейтинга произведений по отзывам."
+
+    def handle(self, *args, **kwargs):
+        """Метод пересчитывает рейтинг всех произведений."""
+        with transaction.atomic():
+            updated = Title.objects.all().rebuild_ratings()
+            Review.objects.all().rebuild_comment_counts()
+            # Рейтинги меняются запросами UPDATE без сигналов.
+            CacheVersion.bump_all()
+        return f"Рейтинг пересчитан для {updated} произведений."
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.models import CacheVersion, Title
+
+
+class Command(BaseCommand):
+    """Перенос эпохи трендовых очков произведений.
+
+    Вклад нового отзыва в трендовые очки растёт с удалением от эпохи
+    (см. reviews.models.TrendingEpoch), поэтому эпоху нужно регулярно
+    переносить на текущий момент, например раз в неделю по расписанию.
+    С флагом --rebuild очки пересчитываются по таблице отзывов.
+    """
+
+    help = "Перенос эпохи трендовых очков произведений."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Пересчитать очки по таблице отзывов.",
+        )
+
+    def handle(self, *args, **options):
+        """Метод переносит эпоху и при необходимости пересчитывает очки."""
+        updated = Title.objects.rescale_trending(time.time())
+        self.stdout.write(
+            f"Эпоха перенесена, обновлено произведений: {updated}"
+        )
+        if options["rebuild"]:
+            updated = Title.objects.all().rebuild_trending()
+            # Пересчёт может изменить порядок трендов.
+            CacheVersion.bump_all()
+            self.stdout.write(
+                f"Очки пересчитаны для произведений: {updated}"
+            )
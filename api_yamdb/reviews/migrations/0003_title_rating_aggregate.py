@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-17 05:51
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def fill_ratings(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    totals = (
+        Review.objects.order_by()
+        .values('title')
+        .annotate(total=Sum('score'), count=Count('pk'), avg=Avg('score'))
+    )
+    for row in totals:
+        Title.objects.filter(pk=row['title']).update(
+            score_sum=row['total'],
+            review_count=row['count'],
+            rating=row['avg'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_auto_20241025_1631'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, editable=False, help_text='Средняя оценка отзывов, пусто если отзывов нет', null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Количество отзывов на произведение', verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Сумма оценок всех отзывов на произведение', verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
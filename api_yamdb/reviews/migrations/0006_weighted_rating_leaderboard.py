@@ -0,0 +1,61 @@
+# Generated by Django 3.2 on 2026-10-17 06:03
+
+from django.db import migrations, models
+from django.db.models import F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast
+
+RATING_PRIOR_MEAN = 5.5
+RATING_PRIOR_WEIGHT = 10
+
+
+def fill_weighted_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    Title.objects.filter(review_count__gt=0).update(
+        weighted_rating=(
+            Cast(F('score_sum'), FloatField())
+            + RATING_PRIOR_WEIGHT * RATING_PRIOR_MEAN
+        ) / (F('review_count') + RATING_PRIOR_WEIGHT)
+    )
+    GenreTitle.objects.update(
+        weighted_rating=Subquery(
+            Title.objects.filter(pk=OuterRef('title_id')).values(
+                'weighted_rating'
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='genretitle',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Взвешенный рейтинг произведения'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, editable=False, help_text='Байесовская оценка для рейтинга лучших произведений', null=True, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', '-weighted_rating', 'title'], name='genretitle_genre_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-weighted_rating', 'id'], name='title_weighted_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-weighted_rating', 'id'], name='title_category_rating_idx'),
+        ),
+        migrations.RunPython(
+            fill_weighted_ratings, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.2 on 2026-10-17 06:35
+
+from django.db import migrations, models
+
+TRENDING_HALF_LIFE = 7 * 24 * 60 * 60
+TRENDING_DEFAULT_EPOCH = 1704067200
+
+
+def rebuild_trending(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    scores = {}
+    reviews = Review.objects.values_list('title_id', 'score', 'pub_date')
+    for title_id, score, pub_date in reviews.iterator():
+        scores[title_id] = scores.get(title_id, 0) + score * 2 ** (
+            (pub_date.timestamp() - TRENDING_DEFAULT_EPOCH)
+            / TRENDING_HALF_LIFE
+        )
+    for title_id, score in scores.items():
+        Title.objects.filter(pk=title_id).update(trending_score=score)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_title_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingEpoch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.FloatField(help_text='Unix-время начала эпохи', verbose_name='Начало эпохи')),
+            ],
+            options={
+                'verbose_name': 'эпоха трендов',
+                'verbose_name_plural': 'Эпохи трендов',
+            },
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False, help_text='Сумма оценок отзывов с затуханием по дате публикации', verbose_name='Трендовые очки'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-trending_score', 'id'], name='title_trending_idx'),
+        ),
+        migrations.RunPython(rebuild_trending, migrations.RunPython.noop),
+    ]
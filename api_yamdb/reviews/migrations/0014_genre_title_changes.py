@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-17 07:08
+
+from django.db import migrations, models
+
+from reviews import genre_changes
+
+
+def install_genre_changes(apps, schema_editor):
+    genre_changes.install(schema_editor.connection)
+
+
+def uninstall_genre_changes(apps, schema_editor):
+    genre_changes.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_author_activity_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenreTitleChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('genre_id', models.BigIntegerField(verbose_name='id жанра')),
+                ('title_id', models.BigIntegerField(verbose_name='id произведения')),
+                ('added', models.BooleanField(null=True, verbose_name='Связь добавлена')),
+            ],
+            options={
+                'verbose_name': 'изменение жанров произведения',
+                'verbose_name_plural': 'Изменения жанров произведений',
+            },
+        ),
+        migrations.RunPython(install_genre_changes, uninstall_genre_changes),
+    ]
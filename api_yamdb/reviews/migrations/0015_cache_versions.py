@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-17 07:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_genre_title_changes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('scope', models.CharField(max_length=256, primary_key=True, serialize=False, verbose_name='Область данных')),
+                ('version', models.BigIntegerField(verbose_name='Версия')),
+                ('modified_at', models.FloatField(help_text='Unix-время последнего изменения', verbose_name='Время изменения')),
+            ],
+            options={
+                'verbose_name': 'версия данных',
+                'verbose_name_plural': 'Версии данных',
+            },
+        ),
+    ]
@@ -1,13 +1,81 @@
+import time
 from datetime import datetime
 
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-
-from api_yamdb.constants import MAX_LENGTH_NAME, MAX_LENGTH_SLUG
+from django.db import connections, models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+    Window,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import (
+    Cast,
+    Coalesce,
+    Greatest,
+    Power,
+    RowNumber,
+)
+
+from api_yamdb.constants import (
+    BULK_MAX_SIZE,
+    MAX_LENGTH_NAME,
+    MAX_LENGTH_SLUG,
+    MAX_SCORE,
+    MIN_SCORE,
+    RATING_PRIOR_MEAN,
+    RATING_PRIOR_WEIGHT,
+    TRENDING_DEFAULT_EPOCH,
+    TRENDING_HALF_LIFE,
+)
 
 User = get_user_model()
 
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+
+def score_count_field(score):
+    """Имя поля Title со счётчиком отзывов с оценкой score."""
+    return f"score_{score}_count"
+
+
+class CounterFieldsModel(models.Model):
+    """Модель со счётчиками, которые меняются только атомарными
+    UPDATE с F() (см. reviews.signals). save() существующей записи
+    не записывает поля counter_fields, иначе устаревшая копия в памяти
+    затёрла бы изменения, сделанные параллельно.
+    """
+
+    counter_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get("force_insert"):
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key and field.attname not in deferred
+                ]
+            kwargs["update_fields"] = [
+                name for name in update_fields
+                if name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
 
 class Genre(models.Model):
     """Модель для жанра произведения."""
@@ -57,8 +125,352 @@ class Category(models.Model):
         return self.slug
 
 
-class Title(models.Model):
-    """Модель для произведения."""
+def rating_expressions(score_sum, review_count, has_reviews):
+    """Выражения для среднего и взвешенного (байесовского) рейтинга.
+    Взвешенный рейтинг сдвигает среднюю оценку к априорной
+    RATING_PRIOR_MEAN с весом RATING_PRIOR_WEIGHT отзывов, поэтому
+    произведение с парой высоких оценок не обгоняет признанные.
+    """
+
+    def if_reviewed(value):
+        return Case(
+            When(has_reviews, then=value),
+            default=None,
+            output_field=FloatField(),
+        )
+
+    total = Cast(score_sum, FloatField())
+    return {
+        "rating": if_reviewed(total / review_count),
+        "weighted_rating": if_reviewed(
+            (total + RATING_PRIOR_WEIGHT * RATING_PRIOR_MEAN)
+            / (review_count + RATING_PRIOR_WEIGHT)
+        ),
+    }
+
+
+def trending_factor(pub_date):
+    """Множитель вклада отзыва от pub_date в трендовые очки:
+    2 ** ((pub_date − эпоха) / TRENDING_HALF_LIFE), см. TrendingEpoch.
+    Эпоха читается подзапросом в том же UPDATE, что и очки.
+    """
+    epoch = Coalesce(
+        Subquery(TrendingEpoch.objects.values("started_at")[:1]),
+        Value(float(TRENDING_DEFAULT_EPOCH)),
+        output_field=FloatField(),
+    )
+    return Power(
+        Value(2.0),
+        (Value(pub_date.timestamp()) - epoch) / Value(TRENDING_HALF_LIFE),
+        output_field=FloatField(),
+    )
+
+
+class TitleQuerySet(models.QuerySet):
+    """QuerySet произведений с поддержкой хранимого рейтинга."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create, заполняющий первичные ключи на SQLite.
+        Django 3.2 не получает ключи из многострочного INSERT в SQLite,
+        поэтому они читаются в той же транзакции: до её фиксации запись
+        в базу заблокирована, и последние ключи принадлежат вставленным
+        строкам (по порядку вставки).
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            missing = [obj for obj in objs if obj.pk is None]
+            if missing and not kwargs.get("ignore_conflicts"):
+                pks = list(
+                    self.model._base_manager.using(self.db)
+                    .order_by("-pk")
+                    .values_list("pk", flat=True)[: len(missing)]
+                )
+                for obj, pk in zip(missing, reversed(pks)):
+                    obj.pk = pk
+        return objs
+
+    def apply_review_change(self, added=None, removed=None, pub_date=None):
+        """Атомарно учитывает добавленную и/или удалённую оценку.
+        Сумма оценок, число отзывов, рейтинг, гистограмма оценок
+        и трендовые очки (если передана дата отзыва pub_date)
+        произведения пересчитываются одним UPDATE-запросом, вторым
+        обновляется взвешенный рейтинг в связях с жанрами.
+        """
+        score_delta = (added or 0) - (removed or 0)
+        count_delta = (added is not None) - (removed is not None)
+        score_sum = F("score_sum") + score_delta
+        review_count = F("review_count") + count_delta
+        trending = {}
+        if pub_date is not None and score_delta:
+            # Вычитание может дать небольшой отрицательный остаток
+            # из-за погрешности вычислений с плавающей точкой.
+            trending["trending_score"] = Greatest(
+                F("trending_score")
+                + Value(float(score_delta)) * trending_factor(pub_date),
+                Value(0.0),
+            )
+        buckets = {}
+        if added != removed:
+            if added is not None:
+                field = score_count_field(added)
+                buckets[field] = F(field) + 1
+            if removed is not None:
+                field = score_count_field(removed)
+                buckets[field] = F(field) - 1
+        updated = self.update(
+            score_sum=score_sum,
+            review_count=review_count,
+            **buckets,
+            **trending,
+            **rating_expressions(
+                score_sum, review_count, Q(review_count__gt=-count_delta)
+            ),
+        )
+        GenreTitle.objects.filter(
+            title__in=self.values("pk")
+        ).refresh_weighted_rating()
+        return updated
+
+    def rebuild_ratings(self):
+        """Пересчитывает рейтинг произведений по таблице отзывов."""
+        reviews = (
+            Review.objects.filter(title=OuterRef("pk"))
+            .order_by()
+            .values("title")
+        )
+        self.update(
+            score_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum("score")).values("total")),
+                0,
+            ),
+            review_count=Coalesce(
+                Subquery(reviews.annotate(total=Count("pk")).values("total")),
+                0,
+            ),
+            **{
+                score_count_field(score): Coalesce(
+                    Subquery(
+                        reviews.filter(score=score)
+                        .annotate(total=Count("pk"))
+                        .values("total")
+                    ),
+                    0,
+                )
+                for score in SCORES
+            },
+        )
+        updated = self.update(
+            **rating_expressions(
+                F("score_sum"), F("review_count"), Q(review_count__gt=0)
+            )
+        )
+        GenreTitle.objects.filter(
+            title__in=self.values("pk")
+        ).refresh_weighted_rating()
+        return updated
+
+    def rebuild_trending(self):
+        """Пересчитывает трендовые очки произведений по таблице
+        отзывов, например после загрузки отзывов без сигналов.
+        """
+        epoch = TrendingEpoch.get_started_at()
+        scores = {}
+        reviews = Review.objects.filter(title__in=self.values("pk"))
+        for title_id, score, pub_date in reviews.values_list(
+            "title_id", "score", "pub_date"
+        ).iterator():
+            scores[title_id] = scores.get(title_id, 0) + score * 2 ** (
+                (pub_date.timestamp() - epoch) / TRENDING_HALF_LIFE
+            )
+        titles = list(self.only("pk"))
+        for title in titles:
+            title.trending_score = scores.get(title.pk, 0)
+        self.model.objects.bulk_update(
+            titles, ("trending_score",), batch_size=BULK_MAX_SIZE
+        )
+        return len(titles)
+
+    def rescale_trending(self, started_at):
+        """Переносит эпоху трендовых очков на момент started_at
+        (Unix-время), умножая очки на 2 ** ((эпоха − started_at) / T).
+        Порядок произведений при этом не меняется, а множители вклада
+        новых отзывов снова становятся близки к единице.
+        """
+        with transaction.atomic(using=self.db):
+            factor = 2 ** (
+                (TrendingEpoch.get_started_at() - started_at)
+                / TRENDING_HALF_LIFE
+            )
+            updated = self.filter(trending_score__gt=0).update(
+                trending_score=F("trending_score") * factor
+            )
+            TrendingEpoch.objects.update_or_create(
+                pk=TrendingEpoch.SINGLETON_PK,
+                defaults={"started_at": started_at},
+            )
+        return updated
+
+    def trending(self, limit):
+        """Произведения с наибольшими трендовыми очками.
+        Выборка идёт по индексу очков и читает только limit строк.
+        """
+        return self.filter(trending_score__gt=0).order_by(
+            "-trending_score", "id"
+        )[:limit]
+
+    def top_rated(self, limit, category=None, genre=None):
+        """Произведения с наибольшим взвешенным рейтингом.
+        Выборка идёт по индексам взвешенного рейтинга: общему,
+        по категории или по жанру (через связи GenreTitle),
+        поэтому читается только limit строк.
+        """
+        queryset = self.filter(weighted_rating__isnull=False)
+        if category:
+            queryset = queryset.filter(category__slug=category)
+        if genre:
+            links = GenreTitle.objects.filter(
+                genre__slug=genre, weighted_rating__isnull=False
+            )
+            if category:
+                links = links.filter(title__category__slug=category)
+            queryset = queryset.filter(
+                pk__in=list(
+                    links.order_by("-weighted_rating", "title_id").values_list(
+                        "title_id", flat=True
+                    )[:limit]
+                )
+            )
+        return queryset.order_by("-weighted_rating", "id")[:limit]
+
+
+class TrendingEpoch(models.Model):
+    """Эпоха трендовых очков произведений (единственная строка).
+    Отзыв с оценкой s от момента t добавляет произведению
+    s · 2 ** ((t − эпоха) / TRENDING_HALF_LIFE) очков. Спад со временем
+    одинаков для всех произведений, поэтому хранимые очки не нужно
+    уменьшать: их порядок совпадает с порядком затухших очков.
+    Множители растут со временем, и эпоху периодически переносят
+    командой rescale_trending. Пока строки нет, эпохой считается
+    TRENDING_DEFAULT_EPOCH.
+    """
+
+    SINGLETON_PK = 1
+
+    started_at = models.FloatField(
+        "Начало эпохи", help_text="Unix-время начала эпохи"
+    )
+
+    class Meta:
+        verbose_name = "эпоха трендов"
+        verbose_name_plural = "Эпохи трендов"
+
+    def __str__(self):
+        return str(self.started_at)
+
+    @classmethod
+    def get_started_at(cls):
+        started_at = cls.objects.values_list("started_at", flat=True).first()
+        if started_at is None:
+            return float(TRENDING_DEFAULT_EPOCH)
+        return started_at
+
+
+class CacheVersionQuerySet(models.QuerySet):
+    def bump(self):
+        """Атомарно увеличивает версии и запоминает время изменения."""
+        return self.update(version=F("version") + 1, modified_at=time.time())
+
+    def bump_scopes(self, scopes):
+        """Атомарно увеличивает версии областей scopes. Для областей
+        без записи она создаётся с версией от текущего времени, чтобы
+        версия не совпала с той, под которой область читалась раньше.
+        На SQLite и PostgreSQL это один запрос INSERT ... ON CONFLICT.
+        """
+        scopes = sorted(set(scopes))
+        now = time.time()
+        connection = connections[self.db]
+        if connection.vendor not in ("sqlite", "postgresql"):
+            if self.filter(scope__in=scopes).bump() < len(scopes):
+                self.bulk_create(
+                    [
+                        self.model(
+                            scope=scope,
+                            version=time.time_ns(),
+                            modified_at=now,
+                        )
+                        for scope in scopes
+                    ],
+                    ignore_conflicts=True,
+                )
+            return
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        rows = ", ".join(["(%s, %s, %s)"] * len(scopes))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (scope, version, modified_at) "
+                f"VALUES {rows} ON CONFLICT (scope) DO UPDATE SET "
+                f"version = {table}.version + 1, "
+                "modified_at = excluded.modified_at",
+                [
+                    value
+                    for scope in scopes
+                    for value in (scope, time.time_ns(), now)
+                ],
+            )
+
+
+class CacheVersion(models.Model):
+    """Версия области данных для кэширования ответов API (api.cache).
+    Версии хранятся в БД, а не в кэше: UPDATE с F() не теряет
+    параллельные увеличения, а новая версия становится видна другим
+    процессам вместе с данными транзакции, которая её увеличила.
+    Области без записи получают версию области EPOCH.
+    """
+
+    EPOCH = "epoch"
+
+    scope = models.CharField(
+        "Область данных", max_length=MAX_LENGTH_NAME, primary_key=True
+    )
+    version = models.BigIntegerField("Версия")
+    modified_at = models.FloatField(
+        "Время изменения", help_text="Unix-время последнего изменения"
+    )
+
+    objects = CacheVersionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "версия данных"
+        verbose_name_plural = "Версии данных"
+
+    def __str__(self):
+        return f"{self.scope}: {self.version}"
+
+    @classmethod
+    def bump_all(cls):
+        """Увеличивает версии всех областей, в том числе областей
+        без записи. Нужна после изменений данных без сигналов.
+        """
+        with transaction.atomic():
+            cls.objects.exclude(scope=cls.EPOCH).bump()
+            cls.objects.bump_scopes((cls.EPOCH,))
+
+
+class Title(CounterFieldsModel):
+    """Модель для произведения.
+    Сумма оценок, число отзывов, рейтинг, гистограмма оценок
+    (поля score_<N>_count) и трендовые очки хранятся в самой модели
+    и обновляются при изменении отзывов (см. reviews.signals).
+    """
+
+    counter_fields = (
+        "score_sum",
+        "review_count",
+        "rating",
+        "weighted_rating",
+        "trending_score",
+        *(score_count_field(score) for score in SCORES),
+    )
 
     name = models.CharField(
         "Имя",
@@ -96,19 +508,112 @@ class Title(models.Model):
         verbose_name="Категория",
         help_text="Категория произведения",
     )
+    score_sum = models.PositiveIntegerField(
+        "Сумма оценок",
+        default=0,
+        editable=False,
+        help_text="Сумма оценок всех отзывов на произведение",
+    )
+    review_count = models.PositiveIntegerField(
+        "Количество отзывов",
+        default=0,
+        editable=False,
+        help_text="Количество отзывов на произведение",
+    )
+    rating = models.FloatField(
+        "Рейтинг",
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Средняя оценка отзывов, пусто если отзывов нет",
+    )
+    weighted_rating = models.FloatField(
+        "Взвешенный рейтинг",
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Байесовская оценка для рейтинга лучших произведений",
+    )
+    trending_score = models.FloatField(
+        "Трендовые очки",
+        default=0,
+        editable=False,
+        help_text="Сумма оценок отзывов с затуханием по дате публикации",
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ("id",)
         verbose_name = "произведение"
         verbose_name_plural = "Произведения"
+        indexes = (
+            models.Index(
+                fields=("-weighted_rating", "id"),
+                name="title_weighted_rating_idx",
+            ),
+            models.Index(
+                fields=("category", "-weighted_rating", "id"),
+                name="title_category_rating_idx",
+            ),
+            # Фильтры и сортировки TitleFilter, см. команду
+            # explain_title_filters. Сортировка дополняется id
+            # в том же направлении, поэтому читается по индексу
+            # в прямом или обратном порядке.
+            models.Index(fields=("name", "id"), name="title_name_idx"),
+            models.Index(fields=("year", "id"), name="title_year_idx"),
+            models.Index(
+                fields=("category", "year"), name="title_category_year_idx"
+            ),
+            models.Index(fields=("rating", "id"), name="title_rating_idx"),
+            models.Index(
+                fields=("review_count", "id"),
+                name="title_review_count_idx",
+            ),
+            models.Index(
+                fields=("-trending_score", "id"), name="title_trending_idx"
+            ),
+        )
 
     def __str__(self):
         return self.name
 
+    @property
+    def score_histogram(self):
+        """Количество отзывов по каждой оценке."""
+        return {
+            score: getattr(self, score_count_field(score)) for score in SCORES
+        }
+
+
+for _score in SCORES:
+    Title.add_to_class(
+        score_count_field(_score),
+        models.PositiveIntegerField(
+            f"Отзывов с оценкой {_score}",
+            default=0,
+            editable=False,
+        ),
+    )
+
+
+class GenreTitleQuerySet(models.QuerySet):
+    def refresh_weighted_rating(self):
+        """Копирует взвешенный рейтинг произведения в связи с жанрами."""
+        return self.update(
+            weighted_rating=Subquery(
+                Title.objects.filter(pk=OuterRef("title_id")).values(
+                    "weighted_rating"
+                )[:1]
+            )
+        )
+
 
 class GenreTitle(models.Model):
     """Модель для связи между жанрами и произведениями.
     Связь между произведением и жанрами многие-к-многим.
+    Взвешенный рейтинг произведения продублирован в связи,
+    чтобы рейтинг лучших в жанре читался по индексу.
     """
 
     genre = models.ForeignKey(
@@ -117,17 +622,111 @@ class GenreTitle(models.Model):
     title = models.ForeignKey(
         Title, on_delete=models.CASCADE, verbose_name="произведение"
     )
+    weighted_rating = models.FloatField(
+        "Взвешенный рейтинг произведения",
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    objects = GenreTitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Жанры Произведения"
         verbose_name_plural = "Жанры Произведения"
+        indexes = (
+            models.Index(
+                fields=("genre", "-weighted_rating", "title"),
+                name="genretitle_genre_rating_idx",
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=("genre", "title"), name="unique_genre_title"
+            ),
+        )
 
     def __str__(self):
         return f"{self.title} {self.genre}"
 
 
-class Review(models.Model):
-    """Модель для отзыва."""
+class GenreTitleChange(models.Model):
+    """Журнал изменений связей жанров и произведений.
+    Записи добавляют триггеры БД (см. reviews.genre_changes), поэтому
+    журнал учитывает и массовые операции. Индекс жанров
+    (api.registry.GenreIndex) применяет записи к битовым картам
+    вместо полной перестройки. Запись с added=None означает, что связи
+    менялись без журнала и индекс нужно перестроить целиком.
+    """
+
+    genre_id = models.BigIntegerField("id жанра")
+    title_id = models.BigIntegerField("id произведения")
+    added = models.BooleanField("Связь добавлена", null=True)
+
+    class Meta:
+        verbose_name = "изменение жанров произведения"
+        verbose_name_plural = "Изменения жанров произведений"
+
+    def __str__(self):
+        return f"{self.genre_id} {self.title_id} {self.added}"
+
+
+class ReviewQuerySet(models.QuerySet):
+    def apply_comment_change(self, delta):
+        """Атомарно меняет счётчик комментариев отзывов на delta."""
+        return self.update(comment_count=F("comment_count") + delta)
+
+    def latest_per_title(self, per_title):
+        """Последние per_title отзывов каждого произведения выборки.
+        Отзывы нумеруются ROW_NUMBER() в окне произведения в порядке
+        индекса (title, -pub_date, -id). Django 3.2 не фильтрует
+        по оконным выражениям, поэтому нумерованная выборка
+        оборачивается подзапросом, а результат остаётся QuerySet.
+        """
+        ranked = (
+            self.order_by()
+            .annotate(
+                row_number=Window(
+                    RowNumber(),
+                    partition_by=F("title_id"),
+                    order_by=(F("pub_date").desc(), F("id").desc()),
+                )
+            )
+            .values("pk", "row_number")
+        )
+        sql, params = ranked.query.sql_with_params()
+        quote_name = connections[self.db].ops.quote_name
+        return self.model.objects.using(self.db).filter(
+            pk__in=RawSQL(
+                f"SELECT {quote_name('id')} FROM ({sql}) ranked "
+                f"WHERE {quote_name('row_number')} <= %s",
+                (*params, per_title),
+            )
+        )
+
+    def rebuild_comment_counts(self):
+        """Пересчитывает счётчик комментариев по таблице комментариев."""
+        return self.update(
+            comment_count=Coalesce(
+                Subquery(
+                    Comment.objects.filter(review=OuterRef("pk"))
+                    .order_by()
+                    .values("review")
+                    .annotate(total=Count("pk"))
+                    .values("total")
+                ),
+                0,
+            )
+        )
+
+
+class Review(CounterFieldsModel):
+    """Модель для отзыва.
+    Количество комментариев хранится в comment_count и обновляется
+    сигналами при создании и удалении комментариев.
+    """
+
+    counter_fields = ("comment_count",)
 
     text = models.TextField(
         verbose_name="текст отзыва",
@@ -166,10 +765,28 @@ class Review(models.Model):
         verbose_name="произведение",
         help_text="Название произведения",
     )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев",
+        default=0,
+        editable=False,
+        help_text="Количество комментариев к отзыву",
+    )
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Отзыв"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("title", "-pub_date", "-id"),
+                name="review_title_pub_date_idx",
+            ),
+            models.Index(
+                fields=("author", "-pub_date", "-id"),
+                name="review_author_pub_date_idx",
+            ),
+        )
 
         constraints = (
             models.UniqueConstraint(
@@ -180,6 +797,11 @@ class Review(models.Model):
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        """Сохраняет отзыв и пересчитывает рейтинг в одной транзакции."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель для комментария."""
@@ -212,6 +834,61 @@ class Comment(models.Model):
     class Meta:
         verbose_name = "Комментарий"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("review", "-pub_date", "-id"),
+                name="comment_review_pub_date_idx",
+            ),
+            models.Index(
+                fields=("author", "-pub_date", "-id"),
+                name="comment_author_pub_date_idx",
+            ),
+        )
 
     def __str__(self):
         return self.text
+
+    def save(self, *args, **kwargs):
+        """Сохраняет комментарий и обновляет счётчик комментариев
+        отзыва в одной транзакции.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class SimilarTitle(models.Model):
+    """Похожее произведение и мера сходства с исходным.
+    Таблица заполняется пакетно командой compute_similar_titles
+    (см. reviews.similarity) и читается по индексу (title, -score).
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="similar_links",
+        verbose_name="произведение",
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="похожее произведение",
+    )
+    score = models.FloatField("Сходство")
+
+    class Meta:
+        verbose_name = "похожее произведение"
+        verbose_name_plural = "Похожие произведения"
+        indexes = (
+            models.Index(
+                fields=("title", "-score"), name="similartitle_title_idx"
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=("title", "similar"), name="unique_similar_title"
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.title} ~ {self.similar}"
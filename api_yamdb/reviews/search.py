@@ -0,0 +1,114 @@
+"""Полнотекстовый поиск по произведениям.
+
+На SQLite используется виртуальная таблица FTS5 над названием
+и описанием произведения. Индекс поддерживается триггерами БД,
+поэтому учитывает и массовые операции (bulk_create, update).
+На других СУБД поиск выполняется через icontains.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = "reviews_title_fts"
+TITLE_TABLE = "reviews_title"
+
+CREATE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"name, description, content='{TITLE_TABLE}', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+INSERT_ROW = (
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description);"
+)
+DELETE_ROW = (
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description);"
+)
+TRIGGERS = {
+    f"{FTS_TABLE}_ai": (
+        f"AFTER INSERT ON {TITLE_TABLE} BEGIN {INSERT_ROW} END"
+    ),
+    f"{FTS_TABLE}_ad": (
+        f"AFTER DELETE ON {TITLE_TABLE} BEGIN {DELETE_ROW} END"
+    ),
+    f"{FTS_TABLE}_au": (
+        f"AFTER UPDATE OF name, description ON {TITLE_TABLE} "
+        f"BEGIN {DELETE_ROW} {INSERT_ROW} END"
+    ),
+}
+
+
+def is_supported(using=connection):
+    return using.vendor == "sqlite"
+
+
+def install(using=connection, repair=False):
+    """Создаёт таблицу индекса и недостающие триггеры.
+    Пересоздание таблицы произведений миграциями SQLite удаляет
+    триггеры, поэтому после каждой миграции функция вызывается
+    с repair=True: триггеры восстанавливаются, только если индекс
+    уже установлен, и тогда индекс перестраивается целиком.
+    """
+    if not is_supported(using):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type IN ('table', 'trigger') AND name LIKE %s",
+            (f"{FTS_TABLE}%",),
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in TRIGGERS if name not in existing]
+        if FTS_TABLE in existing and not missing:
+            return
+        if repair and FTS_TABLE not in existing:
+            return
+        cursor.execute(CREATE_TABLE)
+        for name in missing:
+            cursor.execute(f"CREATE TRIGGER {name} {TRIGGERS[name]}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def uninstall(using=connection):
+    if not is_supported(using):
+        return
+    with using.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def get_terms(text):
+    return re.findall(r"\w+", text or "")
+
+
+def to_match_query(terms):
+    """Каждое слово ищется как префикс, все слова обязательны."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_titles(queryset, text):
+    """Фильтрует произведения по тексту и сортирует по релевантности."""
+    terms = get_terms(text)
+    if not terms:
+        return queryset
+    if not is_supported(connection):
+        condition = Q()
+        for term in terms:
+            condition &= Q(name__icontains=term) | Q(
+                description__icontains=term
+            )
+        return queryset.filter(condition)
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f"{FTS_TABLE}.rowid = {TITLE_TABLE}.id",
+            f"{FTS_TABLE} MATCH %s",
+        ],
+        params=[to_match_query(terms)],
+        select={"search_rank": f"{FTS_TABLE}.rank"},
+    ).order_by("search_rank", "id")
@@ -0,0 +1,201 @@
+from contextvars import ContextVar
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .models import Comment, Genre, GenreTitle, Review, Title, User
+
+
+class Deletion:
+    """Одно удаление через Collector: сначала pre_delete отправляется
+    для всех удаляемых записей, затем post_delete по моделям. Порядок
+    моделей зависит от БД: в SQLite и PostgreSQL родитель удаляется
+    раньше дочерних записей, поэтому набор удаляемых записей живёт
+    до конца удаления.
+    """
+
+    def __init__(self):
+        self.instances = set()
+        self.pending = 0
+        self.started = False
+        self.deferred = set()
+
+    @property
+    def finished(self):
+        return self.started and not self.pending
+
+
+_deletion = ContextVar("deletion", default=None)
+
+
+def get_deletion():
+    """Текущее (или последнее завершённое) удаление."""
+    return _deletion.get()
+
+
+def is_deleting(model, pk):
+    """Удаляется ли запись pk модели model в текущем удалении.
+    Сигналы post_delete дочерних записей не должны обновлять счётчики
+    удаляемого родителя и искать его в БД: это запросы на каждую
+    дочернюю запись.
+    """
+    deletion = _deletion.get()
+    return deletion is not None and (model, pk) in deletion.instances
+
+
+@receiver(pre_delete, sender=Title)
+@receiver(pre_delete, sender=Review)
+@receiver(pre_delete, sender=Comment)
+@receiver(pre_delete, sender=GenreTitle)
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=User)
+def remember_deleting(sender, instance, **kwargs):
+    deletion = _deletion.get()
+    if deletion is None or deletion.started:
+        deletion = Deletion()
+        _deletion.set(deletion)
+    deletion.instances.add((sender, instance.pk))
+    deletion.pending += 1
+
+
+# Подключается раньше остальных обработчиков post_delete: они уже
+# видят, сколько записей осталось удалить.
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=GenreTitle)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=User)
+def forget_deleting(sender, instance, **kwargs):
+    deletion = _deletion.get()
+    deletion.started = True
+    deletion.pending -= 1
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_score(sender, instance, **kwargs):
+    """Запоминает оценку и произведение отзыва до сохранения."""
+    instance._previous = None
+    if instance.pk is None or kwargs.get("raw"):
+        return
+    instance._previous = (
+        Review.objects.filter(pk=instance.pk)
+        .values_list("title_id", "score")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw, **kwargs):
+    """Обновляет хранимый рейтинг и трендовые очки произведения
+    после сохранения отзыва.
+    """
+    if raw:
+        return
+    pub_date = instance.pub_date
+    previous = getattr(instance, "_previous", None)
+    if created or previous is None:
+        Title.objects.filter(pk=instance.title_id).apply_review_change(
+            added=instance.score, pub_date=pub_date
+        )
+        return
+    previous_title_id, previous_score = previous
+    if previous_title_id == instance.title_id:
+        if previous_score != instance.score:
+            Title.objects.filter(pk=instance.title_id).apply_review_change(
+                added=instance.score,
+                removed=previous_score,
+                pub_date=pub_date,
+            )
+        return
+    Title.objects.filter(pk=previous_title_id).apply_review_change(
+        removed=previous_score, pub_date=pub_date
+    )
+    Title.objects.filter(pk=instance.title_id).apply_review_change(
+        added=instance.score, pub_date=pub_date
+    )
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Обновляет хранимый рейтинг и трендовые очки произведения
+    после удаления отзыва. Срабатывает и при каскадном удалении отзывов,
+    кроме удаления вместе с произведением.
+    """
+    if is_deleting(Title, instance.title_id):
+        return
+    Title.objects.filter(pk=instance.title_id).apply_review_change(
+        removed=instance.score, pub_date=instance.pub_date
+    )
+
+
+@receiver(pre_save, sender=Comment)
+def remember_previous_review(sender, instance, **kwargs):
+    """Запоминает отзыв комментария до сохранения."""
+    instance._previous_review_id = None
+    if instance.pk is None or kwargs.get("raw"):
+        return
+    instance._previous_review_id = (
+        Comment.objects.filter(pk=instance.pk)
+        .values_list("review_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, created, raw, **kwargs):
+    """Обновляет счётчик комментариев отзыва после сохранения
+    комментария.
+    """
+    if raw:
+        return
+    if created:
+        Review.objects.filter(pk=instance.review_id).apply_comment_change(1)
+        return
+    previous_review_id = getattr(instance, "_previous_review_id", None)
+    if previous_review_id not in (None, instance.review_id):
+        Review.objects.filter(pk=previous_review_id).apply_comment_change(-1)
+        Review.objects.filter(pk=instance.review_id).apply_comment_change(1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, **kwargs):
+    """Обновляет счётчик комментариев отзыва после удаления комментария.
+    Срабатывает и при каскадном удалении комментариев, кроме удаления
+    вместе с отзывом.
+    """
+    if is_deleting(Review, instance.review_id):
+        return
+    Review.objects.filter(pk=instance.review_id).apply_comment_change(-1)
+
+
+@receiver(pre_save, sender=GenreTitle)
+def copy_weighted_rating(sender, instance, raw, **kwargs):
+    """Копирует взвешенный рейтинг произведения в новую связь с жанром."""
+    if raw:
+        return
+    instance.weighted_rating = (
+        Title.objects.filter(pk=instance.title_id)
+        .values_list("weighted_rating", flat=True)
+        .first()
+    )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def copy_weighted_rating_to_links(sender, instance, action, pk_set, **kwargs):
+    """Связи, созданные через title.genre.add() и set(),
+    сохраняются без pre_save, поэтому рейтинг копируется отдельно.
+    """
+    if action != "post_add" or not pk_set:
+        return
+    if isinstance(instance, Title):
+        links = GenreTitle.objects.filter(title=instance, genre__in=pk_set)
+    else:
+        links = GenreTitle.objects.filter(genre=instance, title__in=pk_set)
+    links.refresh_weighted_rating()
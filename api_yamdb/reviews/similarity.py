@@ -0,0 +1,161 @@
+"""Похожие произведения.
+
+Сходство двух произведений — взвешенная сумма косинусных мер
+по жанрам и по оценкам общих рецензентов. Оценки центрируются
+по среднему каждого автора, поэтому мера по отзывам отражает
+корреляцию оценок, а не только факт отзыва. Отзывы и связи
+с жанрами загружаются в разреженные матрицы SciPy (float32),
+попарные сходства считаются блоками строк, размер которых подобран
+под SIMILAR_MEMORY_BUDGET, и для каждого произведения сохраняются
+лучшие соседи в таблицу SimilarTitle.
+"""
+import math
+from itertools import islice
+
+import numpy as np
+from django.db import transaction
+from scipy import sparse
+
+from api_yamdb.constants import (
+    BULK_MAX_SIZE,
+    SIMILAR_GENRE_WEIGHT,
+    SIMILAR_MEMORY_BUDGET,
+    SIMILAR_TITLES_SIZE,
+)
+from .models import GenreTitle, Review, SimilarTitle, Title
+
+# Значение float32, индекс столбца и временные массивы отбора
+# лучших соседей на один элемент блока сходств.
+BLOCK_ENTRY_BYTES = 40
+
+
+def load_pairs(queryset, fields, dtype):
+    """Массив строк values_list(*fields) без промежуточных списков."""
+    return np.fromiter(
+        queryset.values_list(*fields).iterator(),
+        dtype=[(name, dtype[name]) for name in fields],
+    )
+
+
+def normalize_rows(matrix):
+    """Делит строки матрицы на их длину (нулевые строки не меняются)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags((1 / norms).astype(np.float32)) @ matrix
+
+
+def genre_matrix(title_ids):
+    """Матрица произведения × жанры с единицами в позициях связей."""
+    links = load_pairs(
+        GenreTitle.objects.order_by(),
+        ("title_id", "genre_id"),
+        {"title_id": np.int64, "genre_id": np.int64},
+    )
+    genres, columns = np.unique(links["genre_id"], return_inverse=True)
+    return sparse.csr_matrix(
+        (
+            np.ones(len(links), dtype=np.float32),
+            (np.searchsorted(title_ids, links["title_id"]), columns),
+        ),
+        shape=(len(title_ids), len(genres)),
+    )
+
+
+def review_matrix(title_ids):
+    """Матрица произведения × авторы с оценками, центрированными
+    по средней оценке автора.
+    """
+    reviews = load_pairs(
+        Review.objects.filter(title__isnull=False).order_by(),
+        ("author_id", "title_id", "score"),
+        {"author_id": np.int64, "title_id": np.int64, "score": np.float32},
+    )
+    authors, columns = np.unique(reviews["author_id"], return_inverse=True)
+    means = np.bincount(columns, weights=reviews["score"]) / np.bincount(
+        columns
+    )
+    matrix = sparse.csr_matrix(
+        (
+            (reviews["score"] - means[columns]).astype(np.float32),
+            (np.searchsorted(title_ids, reviews["title_id"]), columns),
+        ),
+        shape=(len(title_ids), len(authors)),
+    )
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def get_block_size(count, budget=SIMILAR_MEMORY_BUDGET):
+    """Число строк блока сходств, при котором блок укладывается
+    в budget байт, даже если все его строки заполнены.
+    """
+    return max(1, budget // (count * BLOCK_ENTRY_BYTES))
+
+
+def iter_similar(limit=SIMILAR_TITLES_SIZE, block_size=None):
+    """Возвращает тройки (id произведения, id похожего, сходство):
+    до limit соседей с положительным сходством на произведение.
+    """
+    title_ids = np.fromiter(
+        Title.objects.order_by("id").values_list("id", flat=True).iterator(),
+        dtype=np.int64,
+    )
+    count = len(title_ids)
+    limit = min(limit, count - 1)
+    if limit < 1:
+        return
+    # Веса мер переносятся в признаки: скалярное произведение строк
+    # объединённой матрицы — взвешенная сумма двух сходств.
+    features = sparse.hstack(
+        (
+            normalize_rows(genre_matrix(title_ids))
+            * np.float32(math.sqrt(SIMILAR_GENRE_WEIGHT)),
+            normalize_rows(review_matrix(title_ids))
+            * np.float32(math.sqrt(1 - SIMILAR_GENRE_WEIGHT)),
+        ),
+        format="csr",
+        dtype=np.float32,
+    )
+    features_t = features.T.tocsc()
+    block_size = block_size or get_block_size(count)
+    for start in range(0, count, block_size):
+        stop = min(start + block_size, count)
+        scores = (features[start:stop] @ features_t).tocsr()
+        rows = np.repeat(np.arange(start, stop), np.diff(scores.indptr))
+        keep = (scores.data > 0) & (scores.indices != rows)
+        rows = rows[keep]
+        columns = scores.indices[keep]
+        values = scores.data[keep]
+        # По строкам, в строке — по убыванию сходства,
+        # при равенстве — по возрастанию id.
+        order = np.lexsort((columns, -values, rows))
+        rows, columns, values = rows[order], columns[order], values[order]
+        ranks = np.arange(len(rows)) - np.searchsorted(rows, rows)
+        best = ranks < limit
+        for row, column, value in zip(
+            rows[best], columns[best], values[best]
+        ):
+            yield (
+                int(title_ids[row]),
+                int(title_ids[column]),
+                float(value),
+            )
+
+
+def compute_similar_titles(limit=SIMILAR_TITLES_SIZE):
+    """Пересчитывает таблицу SimilarTitle целиком.
+    Возвращает количество сохранённых пар.
+    """
+    pairs = iter_similar(limit)
+    stored = 0
+    with transaction.atomic():
+        SimilarTitle.objects.all().delete()
+        while True:
+            batch = [
+                SimilarTitle(title_id=title, similar_id=similar, score=score)
+                for title, similar, score in islice(pairs, BULK_MAX_SIZE)
+            ]
+            if not batch:
+                return stored
+            SimilarTitle.objects.bulk_create(batch)
+            stored += len(batch)
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def api_cache(settings, tmp_path):
+    """Отдельный пустой кэш и реестры для каждого теста: после
+    очистки БД версии данных начинаются заново.
+    """
+    from api.registry import CATEGORIES, GENRE_INDEX, GENRES
+
+    settings.CACHES = {
+        **settings.CACHES,
+        "default": {
+            **settings.CACHES["default"],
+            "LOCATION": str(tmp_path),
+        },
+    }
+    for registry in (GENRES, CATEGORIES, GENRE_INDEX):
+        registry.invalidate()
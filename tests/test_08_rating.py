@@ -0,0 +1,143 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = "/api/v1/titles/{title_id}/"
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        "/api/v1/titles/{title_id}/reviews/{review_id}/"
+    )
+
+    def get_title(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_review_writes(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]["id"]
+        assert self.get_title(client, title_id)["rating"] == 5, (
+            "Проверьте, что рейтинг произведения обновляется при создании "
+            "отзыва."
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]["id"]
+            ),
+            data={"score": 10},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(client, title_id)["rating"] == 7, (
+            "Проверьте, что рейтинг произведения обновляется при изменении "
+            "оценки отзыва."
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]["id"]
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_title(client, title_id)["rating"] == 10, (
+            "Проверьте, что рейтинг произведения обновляется при удалении "
+            "отзыва."
+        )
+
+        user.delete()
+        assert self.get_title(client, title_id)["rating"] is None, (
+            "Проверьте, что рейтинг произведения обновляется при каскадном "
+            "удалении отзывов."
+        )
+
+    def test_02_rebuild_ratings_command(
+        self, client, admin_client, admin, user_client, user
+    ):
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]["id"]
+        Title.objects.update(
+            score_sum=0, review_count=0, rating=None, score_5_count=0
+        )
+
+        call_command("rebuild_ratings")
+        title = Title.objects.get(pk=title_id)
+        assert (
+            title.score_sum,
+            title.review_count,
+            title.rating,
+            title.score_5_count,
+        ) == (10, 2, 5, 2), (
+            "Проверьте, что команда `rebuild_ratings` пересчитывает рейтинг "
+            "произведений по отзывам."
+        )
+
+    def test_03_score_histogram(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]["id"])
+        assert "score_histogram" not in client.get(url).json()
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]["id"], review_id=reviews[1]["id"]
+            ),
+            data={"score": 8},
+        )
+        data = client.get(url, {"histogram": "true"}).json()
+        expected = {str(score): 0 for score in range(1, 11)}
+        expected.update({"5": 1, "8": 1})
+        assert data.get("score_histogram") == expected, (
+            f"Проверьте, что GET-запрос к `{self.TITLE_DETAIL_URL_TEMPLATE}` "
+            "с параметром `histogram=true` возвращает распределение оценок."
+        )
+        assert data.get("review_count") == 2
+
+        user.delete()
+        data = client.get(url, {"histogram": "true"}).json()
+        assert data["score_histogram"]["8"] == 0
+        assert data["review_count"] == 1
+
+    def test_04_stale_title_save_keeps_counters(
+        self, client, admin_client, admin
+    ):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name="Терминатор", year=1984)
+        stale = Title.objects.get(pk=title.pk)
+        Review.objects.create(title=title, author=admin, text="Отзыв", score=9)
+        stale.name = "Терминатор 2"
+        stale.save()
+        title.refresh_from_db()
+        assert (
+            title.name,
+            title.review_count,
+            title.score_sum,
+            title.rating,
+            title.score_9_count,
+        ) == ("Терминатор 2", 1, 9, 9, 1), (
+            "Проверьте, что сохранение произведения не затирает счётчики, "
+            "обновлённые отзывами после загрузки произведения."
+        )
+
+        response = admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.pk),
+            data={"description": "Описание"},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(client, title.pk)["rating"] == 9
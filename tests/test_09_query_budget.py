@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+
+from tests.utils import create_catalog, create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryBudget:
+
+    TITLES_URL = "/api/v1/titles/"
+    TITLES_DETAIL_URL_TEMPLATE = "/api/v1/titles/{title_id}/"
+
+    # Версии данных (один запрос за запрос к API, см. api.cache),
+    # страница: COUNT(*), произведения с категорией, жанры.
+    LIST_QUERIES = 4
+    # Все произведения на одной странице: количество известно
+    # без COUNT(*).
+    SINGLE_PAGE_LIST_QUERIES = 3
+    # Версии данных, произведение с категорией и его жанры.
+    RETRIEVE_QUERIES = 3
+    # Пользователь, версии данных для реестра слагов, INSERT,
+    # версии произведения, BEGIN, недостающие связи с жанрами,
+    # INSERT связей, копирование взвешенного рейтинга в связи,
+    # версии связей. Слаги разрешаются по реестру в памяти, ответ
+    # строится без запросов к БД.
+    CREATE_QUERIES = 9
+    # Пользователь, произведение с категорией, его жанры, UPDATE,
+    # версии произведения.
+    UPDATE_QUERIES = 5
+    # То же, версии данных для реестра слагов и замена жанров: BEGIN,
+    # текущие связи, удаляемые связи, DELETE, версии удалённой связи,
+    # недостающие связи, INSERT, копирование рейтинга, версии связей.
+    UPDATE_GENRE_QUERIES = 15
+
+    @pytest.mark.parametrize("title_count", (1, 5, 12))
+    def test_01_title_list(
+        self, client, django_assert_num_queries, title_count
+    ):
+        create_catalog(title_count)
+        queries = (
+            self.SINGLE_PAGE_LIST_QUERIES
+            if title_count <= settings.REST_FRAMEWORK["PAGE_SIZE"]
+            else self.LIST_QUERIES
+        )
+        with django_assert_num_queries(queries):
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["count"] == title_count, (
+            f"Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет "
+            "постоянное число запросов к БД независимо от размера страницы."
+        )
+
+    def test_02_title_retrieve(self, client, django_assert_num_queries):
+        titles = create_catalog(3)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[-1].id)
+        with django_assert_num_queries(self.RETRIEVE_QUERIES):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()["genre"]) == 3
+
+    def test_03_title_create(
+        self, admin_client, django_assert_num_queries
+    ):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = {
+            "name": "Терминатор",
+            "year": 1984,
+            "genre": [genres[0]["slug"], genres[1]["slug"]],
+            "category": categories[0]["slug"],
+        }
+        # Первый запрос загружает реестр жанров и категорий.
+        admin_client.post(self.TITLES_URL, data=data)
+        with django_assert_num_queries(self.CREATE_QUERIES):
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()["genre"] == genres[:2]
+
+    @pytest.mark.parametrize(
+        "data, queries",
+        (
+            ({"name": "Новое название"}, UPDATE_QUERIES),
+            ({"genre": ["genre-1", "genre-2"]}, UPDATE_GENRE_QUERIES),
+        ),
+    )
+    def test_04_title_update(
+        self,
+        client,
+        admin_client,
+        user_client,
+        django_assert_num_queries,
+        data,
+        queries,
+    ):
+        title = create_catalog(1)[0]
+        user_client.post(
+            f"/api/v1/titles/{title.id}/reviews/",
+            data={"text": "Отзыв", "score": 7},
+        )
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        # Прогрев реестра жанров и категорий.
+        admin_client.patch(
+            url, data={"genre": ["genre-0"], "category": "cat-0"}
+        )
+        with django_assert_num_queries(queries):
+            response = admin_client.patch(url, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == client.get(url).json(), (
+            "Проверьте, что ответ на PATCH-запрос к "
+            f"`{self.TITLES_DETAIL_URL_TEMPLATE}` совпадает с ответом "
+            "на GET-запрос, включая рейтинг."
+        )
+        assert response.json()["rating"] == 7
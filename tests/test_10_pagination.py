@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_title_with_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = "/api/v1/titles/{title_id}/reviews/"
+
+    def test_01_reviews_cursor_walk(self, client, django_user_model):
+        title = create_title_with_reviews(django_user_model, 12)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        expected = list(
+            title.reviews.order_by("-pub_date", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+        response = client.get(url, {"pagination": "cursor"})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert "count" not in data, (
+            f"Проверьте, что курсорная пагинация `{url}` не выполняет "
+            "подсчёт общего количества записей."
+        )
+        assert data["previous"] is None
+        pages = [data]
+        while data["next"]:
+            data = client.get(data["next"]).json()
+            pages.append(data)
+        received = [item["id"] for page in pages for item in page["results"]]
+        assert received == expected, (
+            f"Проверьте, что курсорная пагинация `{url}` возвращает все "
+            "отзывы по убыванию даты публикации без пропусков и повторов."
+        )
+
+        previous = client.get(pages[-1]["previous"]).json()
+        assert previous["results"] == pages[-2]["results"], (
+            f"Проверьте, что ссылка `previous` курсорной пагинации `{url}` "
+            "возвращает предыдущую страницу."
+        )
+
+    def test_02_invalid_cursor(self, client, django_user_model):
+        title = create_title_with_reviews(django_user_model, 1)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        response = client.get(url, {"cursor": "broken"})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f"Проверьте, что GET-запрос к `{url}` с некорректным курсором "
+            "возвращает ответ со статусом 404."
+        )
@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleCache:
+
+    TITLES_URL = "/api/v1/titles/"
+    TITLES_DETAIL_URL_TEMPLATE = "/api/v1/titles/{title_id}/"
+    CACHE_STATS_URL = "/api/v1/titles/cache-stats/"
+
+    def get_stats(self, admin_client):
+        response = admin_client.get(self.CACHE_STATS_URL)
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_cache_hits_and_invalidation(
+        self, client, admin_client, user_client
+    ):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]["id"])
+
+        before = self.get_stats(admin_client)
+        first = client.get(url).json()
+        second = client.get(url).json()
+        after = self.get_stats(admin_client)
+        assert first == second
+        assert after["hits"] - before["hits"] == 1, (
+            f"Проверьте, что повторный GET-запрос к `{url}` обслуживается "
+            "из кэша."
+        )
+        assert after["misses"] - before["misses"] == 1
+
+        create_single_review(user_client, titles[0]["id"], "Отлично", 9)
+        assert client.get(url).json()["rating"] == 9, (
+            "Проверьте, что кэш произведения сбрасывается при создании "
+            "отзыва."
+        )
+        response = admin_client.patch(url, data={"name": "Новое имя"})
+        assert response.status_code == HTTPStatus.OK
+        names = {
+            title["name"]
+            for title in client.get(self.TITLES_URL).json()["results"]
+        }
+        assert "Новое имя" in names, (
+            "Проверьте, что кэш списка произведений сбрасывается при "
+            "изменении произведения."
+        )
+
+    def test_02_filters_are_normalized(self, client, admin_client):
+        create_titles(admin_client)
+        before = self.get_stats(admin_client)
+        client.get(self.TITLES_URL, {"year": "1984"})
+        client.get(self.TITLES_URL, {"year": "01984", "genre": ""})
+        after = self.get_stats(admin_client)
+        assert after["hits"] - before["hits"] == 1, (
+            "Проверьте, что эквивалентные параметры фильтрации используют "
+            "один ключ кэша."
+        )
+
+    def test_03_cache_stats_admin_only(self, client, user_client):
+        assert client.get(self.CACHE_STATS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.CACHE_STATS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_04_versions_in_database(self):
+        from django.db import transaction
+
+        from api.cache import CATALOG, bump_versions, get_versions
+        from reviews.models import CacheVersion
+
+        (initial,) = get_versions(CATALOG)
+        bump_versions(CATALOG)
+        (version,) = get_versions(CATALOG)
+        assert version != initial
+        bump_versions(CATALOG)
+        bump_versions(CATALOG)
+        assert CacheVersion.objects.get(scope=CATALOG).version == (
+            version + 2
+        ), (
+            "Проверьте, что версии данных хранятся в БД и увеличиваются "
+            "атомарно."
+        )
+        with pytest.raises(RuntimeError), transaction.atomic():
+            bump_versions(CATALOG)
+            raise RuntimeError
+        assert get_versions(CATALOG) == (version + 2,), (
+            "Проверьте, что версия увеличивается в транзакции записи."
+        )
+
+    def test_05_commands_reset_cache(self, client, admin_client, admin):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]["id"])
+        assert client.get(url).json()["rating"] is None
+        # bulk_create не отправляет сигналы, как загрузка из CSV.
+        Review.objects.bulk_create(
+            [
+                Review(
+                    title_id=titles[0]["id"], author=admin, text="Да", score=7
+                )
+            ]
+        )
+        call_command("rebuild_ratings", stdout=None)
+        assert client.get(url).json()["rating"] == 7, (
+            "Проверьте, что команды, меняющие данные без сигналов, "
+            "сбрасывают кэш ответов API."
+        )
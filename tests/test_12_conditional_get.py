@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    create_reviews,
+    create_single_comment,
+    create_titles,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    TITLES_DETAIL_URL_TEMPLATE = "/api/v1/titles/{title_id}/"
+    REVIEWS_URL_TEMPLATE = "/api/v1/titles/{title_id}/reviews/"
+    COMMENTS_URL_TEMPLATE = (
+        "/api/v1/titles/{title_id}/reviews/{review_id}/comments/"
+    )
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get("ETag")
+        assert etag, (
+            f"Проверьте, что ответ на GET-запрос к `{url}` содержит "
+            "заголовок `ETag`."
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Проверьте, что GET-запрос к `{url}` с заголовком "
+            "`If-None-Match` для неизменённых данных возвращает ответ со "
+            "статусом 304."
+        )
+        return etag
+
+    def test_01_titles_genres_categories(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]["id"])
+        etag = self.check_not_modified(client, url)
+        self.check_not_modified(client, "/api/v1/genres/")
+        last_modified = client.get("/api/v1/categories/").get(
+            "Last-Modified"
+        )
+        assert last_modified
+        response = client.get(
+            "/api/v1/categories/", HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            "Проверьте, что GET-запрос к `/api/v1/categories/` с заголовком "
+            "`If-Modified-Since` для неизменённых данных возвращает ответ "
+            "со статусом 304."
+        )
+
+        admin_client.patch(url, data={"name": "Новое имя"})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Проверьте, что после изменения произведения GET-запрос к "
+            f"`{url}` со старым `ETag` возвращает ответ со статусом 200."
+        )
+
+    def test_02_reviews_and_comments(
+        self, client, admin_client, admin, user_client, user
+    ):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]["id"]
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]["id"], review_id=reviews[0]["id"]
+        )
+        reviews_etag = self.check_not_modified(client, reviews_url)
+        comments_etag = self.check_not_modified(client, comments_url)
+
+        create_single_comment(
+            user_client, titles[0]["id"], reviews[0]["id"], "Согласен"
+        )
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["count"] == 1
+
+        user.username = "RenamedUser"
+        user.save()
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что после переименования автора GET-запрос к "
+            f"`{reviews_url}` со старым `ETag` возвращает ответ со статусом "
+            "200."
+        )
+
+    def test_03_star_requires_existing_resource(
+        self, client, admin_client, admin, user_client, user
+    ):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]["id"]
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]["id"]
+        )
+        for url in (title_url, f"{reviews_url}{reviews[0]['id']}/"):
+            response = client.get(url, HTTP_IF_NONE_MATCH="*")
+            assert response.status_code == HTTPStatus.NOT_MODIFIED
+        for url, expected in (
+            (self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=999), 404),
+            (f"{reviews_url}9999/", 404),
+            (self.REVIEWS_URL_TEMPLATE.format(title_id=999), 404),
+            ("/api/v1/titles/?ordering=unknown", 400),
+            (f"/api/v1/reviews/?title_ids={titles[0]['id']}&per_title=0", 400),
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH="*")
+            assert response.status_code == expected, (
+                f"Проверьте, что GET-запрос к `{url}` с заголовком "
+                "`If-None-Match: *` возвращает ошибку, а не 304, если "
+                "ресурса нет или параметры запроса неверны."
+            )
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = "/api/v1/titles/"
+    TITLES_DETAIL_URL_TEMPLATE = "/api/v1/titles/{title_id}/"
+
+    def search(self, client, text, **params):
+        response = client.get(self.TITLES_URL, {"search": text, **params})
+        assert response.status_code == HTTPStatus.OK
+        return [title["name"] for title in response.json()["results"]]
+
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.search(client, "орешек") == [titles[1]["name"]], (
+            f"Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` "
+            "ищет произведения по названию."
+        )
+        assert self.search(client, "Yippie") == [titles[1]["name"]], (
+            f"Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` "
+            "ищет произведения по описанию."
+        )
+        assert self.search(client, "терм") == [titles[0]["name"]], (
+            f"Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` "
+            "ищет по началу слова."
+        )
+        assert self.search(client, '"*(') == [
+            title["name"] for title in titles
+        ]
+
+    def test_02_search_index_follows_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]["id"])
+        admin_client.patch(url, data={"name": "Чужой"})
+        assert self.search(client, "Терминатор") == []
+        assert self.search(client, "чужой") == ["Чужой"], (
+            "Проверьте, что поисковый индекс обновляется при изменении "
+            "произведения."
+        )
+        admin_client.delete(url)
+        assert self.search(client, "чужой") == []
+
+    def test_03_results_ranked_by_relevance(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name="Сборник",
+            year=2000,
+            description="Рассказы о дальних странах, морях и горах, "
+            "среди которых есть и рассказ про чужой город.",
+        )
+        Title.objects.create(
+            name="Чужой", year=1979, description="Чужой на борту корабля."
+        )
+        expected = ["Чужой", "Сборник"]
+        assert self.search(client, "чужой") == expected, (
+            "Проверьте, что результаты поиска упорядочены по релевантности."
+        )
+        assert self.search(client, "чужой", pagination="cursor") == (
+            expected
+        ), (
+            "Проверьте, что курсорный режим не меняет порядок результатов "
+            "поиска по релевантности."
+        )
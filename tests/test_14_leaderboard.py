@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Leaderboard:
+
+    TOP_URL = "/api/v1/titles/top/"
+
+    def get_top(self, client, **params):
+        response = client.get(self.TOP_URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Проверьте, что GET-запрос к `{self.TOP_URL}` возвращает ответ "
+            "со статусом 200."
+        )
+        return [title["id"] for title in response.json()]
+
+    def test_01_top_titles(
+        self, client, admin_client, user_client, moderator_client
+    ):
+        titles, categories, genres = create_titles(admin_client)
+        assert self.get_top(client) == [], (
+            "Проверьте, что произведения без отзывов не попадают в рейтинг "
+            "лучших."
+        )
+
+        first, second = titles[0]["id"], titles[1]["id"]
+        create_single_review(user_client, first, "Хорошо", 10)
+        create_single_review(user_client, second, "Неплохо", 9)
+        create_single_review(moderator_client, second, "Отлично", 9)
+        assert self.get_top(client) == [second, first], (
+            "Проверьте, что рейтинг лучших учитывает количество отзывов "
+            "(взвешенная оценка)."
+        )
+        assert self.get_top(client, limit=1) == [second]
+        assert self.get_top(client, category=categories[0]["slug"]) == [
+            first
+        ]
+        assert self.get_top(client, genre=genres[2]["slug"]) == [second], (
+            "Проверьте, что рейтинг лучших фильтруется по жанру."
+        )
+        assert self.get_top(client, genre=genres[0]["slug"]) == [first]
+
+        response = admin_client.patch(
+            f"/api/v1/titles/{second}/", data={"genre": [genres[0]["slug"]]}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_top(client, genre=genres[0]["slug"]) == [
+            second,
+            first,
+        ], (
+            "Проверьте, что рейтинг лучших в жанре обновляется при "
+            "изменении жанров произведения."
+        )
+
+    def test_02_invalid_limit(self, client):
+        response = client.get(self.TOP_URL, {"limit": 1000})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,129 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalog, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleBulk:
+
+    BULK_URL = "/api/v1/titles/bulk/"
+    TITLES_DETAIL_URL_TEMPLATE = "/api/v1/titles/{title_id}/"
+
+    def make_items(self, count):
+        return [
+            {
+                "name": f"Новое произведение {idx}",
+                "year": 1990 + idx % 30,
+                "genre": ["genre-0", "genre-2"],
+                "category": "cat-1",
+            }
+            for idx in range(count)
+        ]
+
+    def post_bulk(self, client, data):
+        return client.post(self.BULK_URL, data=data, format="json")
+
+    def patch_bulk(self, client, data):
+        return client.patch(self.BULK_URL, data=data, format="json")
+
+    def test_01_bulk_create(self, client, admin_client):
+        from reviews.models import Title
+
+        create_catalog(1)
+        response = self.post_bulk(admin_client, self.make_items(3))
+        assert response.status_code == HTTPStatus.CREATED, (
+            f"Проверьте, что POST-запрос администратора к `{self.BULK_URL}` "
+            "со списком произведений возвращает ответ со статусом 201."
+        )
+        data = response.json()
+        assert [title["name"] for title in data] == [
+            f"Новое произведение {idx}" for idx in range(3)
+        ]
+        for title in data:
+            stored = Title.objects.get(pk=title["id"])
+            assert stored.name == title["name"], (
+                "Проверьте, что в ответе на массовое создание указаны "
+                "идентификаторы созданных произведений."
+            )
+            assert sorted(
+                stored.genre.values_list("slug", flat=True)
+            ) == ["genre-0", "genre-2"]
+        detail = client.get(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=data[0]["id"])
+        ).json()
+        assert detail == data[0]
+
+    def test_02_bulk_create_queries(
+        self, admin_client, django_assert_max_num_queries
+    ):
+        create_catalog(1)
+        with django_assert_max_num_queries(12) as small:
+            self.post_bulk(admin_client, self.make_items(2))
+        with django_assert_max_num_queries(len(small)):
+            response = self.post_bulk(admin_client, self.make_items(50))
+        assert response.status_code == HTTPStatus.CREATED, (
+            "Проверьте, что массовое создание выполняет постоянное число "
+            "запросов к БД независимо от количества произведений."
+        )
+
+    def test_03_per_item_errors(self, admin_client):
+        from reviews.models import Title
+
+        create_catalog(1)
+        items = self.make_items(3)
+        items[1]["genre"] = ["genre-0", "unknown"]
+        items[2]["year"] = 3000
+        response = self.post_bulk(admin_client, items)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3 and errors[0] == {}, (
+            "Проверьте, что ошибки массового создания возвращаются "
+            "списком по элементам запроса."
+        )
+        assert "genre" in errors[1] and "year" in errors[2]
+        assert Title.objects.count() == 1, (
+            "Проверьте, что при ошибке в одном из элементов произведения "
+            "не создаются."
+        )
+
+    def test_04_bulk_update(self, client, admin_client, user_client):
+        titles = create_catalog(3)
+        create_single_review(user_client, titles[1].id, "Отлично", 10)
+        items = [
+            {"id": titles[0].id, "name": "Новое название"},
+            {"id": titles[1].id, "genre": ["genre-2"], "category": "cat-0"},
+        ]
+        response = self.patch_bulk(admin_client, items)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Проверьте, что PATCH-запрос администратора к `{self.BULK_URL}` "
+            "изменяет произведения."
+        )
+        data = response.json()
+        assert data[0]["name"] == "Новое название"
+        assert [genre["slug"] for genre in data[1]["genre"]] == ["genre-2"]
+        assert data[1]["category"]["slug"] == "cat-0"
+        top = client.get("/api/v1/titles/top/", {"genre": "genre-2"}).json()
+        assert [title["id"] for title in top] == [titles[1].id], (
+            "Проверьте, что массовое изменение жанров учитывается в рейтинге "
+            "лучших в жанре."
+        )
+
+        response = self.patch_bulk(
+            admin_client, [{"name": "Без id"}, {"id": 0, "name": "Нет"}]
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert all("id" in error for error in response.json())
+
+    def test_05_bulk_permissions(self, user_client):
+        create_catalog(1)
+        for test_client in (user_client,):
+            response = self.post_bulk(test_client, self.make_items(1))
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED,
+                HTTPStatus.FORBIDDEN,
+            ), (
+                "Проверьте, что массовое создание произведений доступно "
+                "только администратору."
+            )
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalog
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SparseFields:
+
+    TITLES_URL = "/api/v1/titles/"
+    TITLES_DETAIL_URL_TEMPLATE = "/api/v1/titles/{title_id}/"
+
+    def test_01_fields(self, client, django_assert_num_queries):
+        create_catalog(3)
+        # Версии данных и произведения: жанры не загружаются,
+        # а количество единственной страницы известно без COUNT(*).
+        with django_assert_num_queries(2) as context:
+            response = client.get(
+                self.TITLES_URL, {"fields": "id,name,rating"}
+            )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()["results"]
+        assert all(
+            set(title) == {"id", "name", "rating"} for title in results
+        ), (
+            f"Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром "
+            "`fields` возвращает только перечисленные поля."
+        )
+        titles_sql = context.captured_queries[-1]["sql"]
+        assert "description" not in titles_sql, (
+            "Проверьте, что невыводимые текстовые поля не загружаются из БД."
+        )
+        assert "reviews_category" not in titles_sql
+
+    def test_02_expand(self, client):
+        titles = create_catalog(3)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[-1].id)
+        full = client.get(url).json()
+        assert full["genre"][0] == {"name": "Жанр 0", "slug": "genre-0"}
+
+        data = client.get(url, {"expand": "genre"}).json()
+        assert data["genre"] == full["genre"]
+        assert data["category"] == full["category"]["slug"], (
+            "Проверьте, что связи, не указанные в `expand`, выводятся "
+            "слагами."
+        )
+        data = client.get(url, {"expand": "", "fields": "genre"}).json()
+        assert data == {"genre": ["genre-0", "genre-1", "genre-2"]}
+
+    def test_03_unknown_fields(self, client):
+        create_catalog(1)
+        for params in ({"fields": "id,secret"}, {"expand": "author"}):
+            response = client.get(self.TITLES_URL, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                "Проверьте, что неизвестные поля в параметрах `fields` и "
+                "`expand` приводят к ответу со статусом 400."
+            )
@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalog, create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ValuesSerialization:
+
+    TITLES_URL = "/api/v1/titles/"
+
+    def assert_list_matches_detail(self, client, url, params=None):
+        response = client.get(url, params or {})
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()["results"]
+        assert results
+        for item in results:
+            detail = client.get(f"{url}{item['id']}/", params or {}).json()
+            assert item == detail, (
+                f"Проверьте, что элементы списка `{url}` сериализуются так "
+                "же, как при запросе отдельного объекта."
+            )
+
+    @pytest.mark.parametrize(
+        "params",
+        (
+            {},
+            {"histogram": "true"},
+            {"fields": "id,name,genre", "expand": ""},
+            {"expand": "category", "pagination": "cursor"},
+        ),
+    )
+    def test_01_titles(self, client, params):
+        from reviews.models import Title
+
+        titles = create_catalog(4)
+        Title.objects.filter(pk=titles[0].pk).update(
+            category=None, rating=7.5
+        )
+        self.assert_list_matches_detail(client, self.TITLES_URL, params)
+
+    def test_02_reviews_and_comments(
+        self, client, admin_client, admin, user_client, user
+    ):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]["id"]
+        self.assert_list_matches_detail(
+            client, f"/api/v1/titles/{title_id}/reviews/"
+        )
+        self.assert_list_matches_detail(
+            client,
+            f"/api/v1/titles/{title_id}/reviews/{reviews[0]['id']}/comments/",
+        )
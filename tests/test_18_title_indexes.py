@@ -0,0 +1,45 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+
+from tests.utils import create_catalog
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleIndexes:
+
+    @pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="План запроса SQLite."
+    )
+    def test_01_filters_use_indexes(self):
+        create_catalog(1)
+        stdout = StringIO()
+        call_command(
+            "explain_title_filters",
+            "--filters",
+            "category",
+            "genre",
+            "name",
+            "year",
+            stdout=stdout,
+        )
+        plans = stdout.getvalue().split("Фильтры: ")[1:]
+        assert len(plans) == 16
+        for plan in plans:
+            filters, _, steps = plan.partition("\n")
+            if filters == "без фильтров":
+                continue
+            assert "SCAN reviews_title" not in steps, (
+                "Проверьте, что список произведений с фильтрами "
+                f"{filters} не просматривает таблицу произведений целиком."
+            )
+
+    def test_02_unique_genre_title(self):
+        from reviews.models import GenreTitle
+
+        title = create_catalog(1)[0]
+        link = GenreTitle.objects.get(title=title)
+        with pytest.raises(IntegrityError):
+            GenreTitle.objects.create(title=title, genre=link.genre)
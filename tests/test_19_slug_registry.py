@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalog
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19SlugRegistry:
+
+    TITLES_URL = "/api/v1/titles/"
+
+    def get_ids(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [title["id"] for title in response.json()["results"]]
+
+    def test_01_filter_without_slug_joins(
+        self, client, django_assert_num_queries
+    ):
+        titles = create_catalog(3)
+        assert self.get_ids(client, genre="genre-2", category="cat-0") == [
+            titles[2].id
+        ]
+        with django_assert_num_queries(3) as context:
+            self.get_ids(client, genre="genre-1", category="cat-1")
+        _, _, where = context.captured_queries[1]["sql"].partition(" WHERE ")
+        assert "slug" not in where, (
+            "Проверьте, что фильтры по слагу жанра и категории не "
+            "присоединяют таблицы жанров и категорий."
+        )
+
+    def test_02_invalidation_by_slug_views(self, admin_client):
+        create_catalog(1)
+        data = {
+            "name": "Новое",
+            "year": 2000,
+            "genre": ["new"],
+            "category": "cat-0",
+        }
+        response = admin_client.post(
+            "/api/v1/genres/", data={"name": "Новый", "slug": "new"}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            "Проверьте, что новый жанр можно указать при создании "
+            "произведения."
+        )
+        admin_client.delete("/api/v1/genres/new/")
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            "Проверьте, что удалённый жанр нельзя указать при создании "
+            "произведения."
+        )
+
+    def test_03_changes_from_other_process(self, client):
+        from api.cache import TAXONOMY, bump_versions
+        from reviews.models import Genre
+
+        titles = create_catalog(1)
+        assert self.get_ids(client, genre="genre-0") == [titles[0].id]
+        Genre.objects.filter(slug="genre-0").update(slug="renamed")
+        bump_versions(TAXONOMY)
+        assert self.get_ids(client, genre="renamed") == [titles[0].id]
+        assert self.get_ids(client, genre="genre-0") == []
@@ -0,0 +1,107 @@
+import csv
+import gzip
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_catalog
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleExport:
+
+    EXPORT_URL = "/api/v1/titles/export/"
+    TITLES_DETAIL_URL_TEMPLATE = "/api/v1/titles/{title_id}/"
+
+    def get_export(self, client, **params):
+        response = client.get(self.EXPORT_URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Проверьте, что GET-запрос к `{self.EXPORT_URL}` "
+            "возвращает ответ со статусом 200."
+        )
+        assert response.streaming, (
+            "Проверьте, что выгрузка отдаётся потоковым ответом."
+        )
+        return response, b"".join(response.streaming_content)
+
+    def test_01_ndjson_matches_detail(self, client):
+        titles = create_catalog(4)
+        response, content = self.get_export(client)
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in content.decode().splitlines()]
+        assert [title["id"] for title in lines] == [
+            title.id for title in titles
+        ]
+        for line in lines:
+            detail = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=line["id"])
+            ).json()
+            assert line == detail, (
+                "Проверьте, что строка NDJSON совпадает с ответом "
+                "на запрос произведения."
+            )
+
+    def test_02_csv_with_filters(self, client):
+        create_catalog(4)
+        response, content = self.get_export(
+            client, file_format="csv", category="cat-1"
+        )
+        assert response["Content-Type"] == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        assert [row["name"] for row in rows] == [
+            "Произведение 1",
+            "Произведение 3",
+        ], "Проверьте, что выгрузка учитывает фильтры произведений."
+        assert rows[0]["category"] == "cat-1"
+        assert rows[0]["genre"] == "genre-0,genre-1"
+        assert rows[0]["rating"] == ""
+
+    def test_03_gzip(self, client):
+        create_catalog(3)
+        response, content = self.get_export(client, gzip="true")
+        assert response["Content-Type"] == "application/gzip"
+        assert 'filename="titles.ndjson.gz"' in (
+            response["Content-Disposition"]
+        )
+        _, plain = self.get_export(client)
+        assert gzip.decompress(content) == plain, (
+            "Проверьте, что сжатая выгрузка совпадает с несжатой."
+        )
+
+    def test_04_invalid_format(self, client):
+        response = client.get(self.EXPORT_URL, {"file_format": "xml"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_queries_per_chunk(self, django_assert_num_queries):
+        from api.export import export_titles
+        from reviews.models import Title
+
+        create_catalog(5)
+        # Запрос произведений и по запросу жанров на каждую порцию.
+        with django_assert_num_queries(4):
+            content = b"".join(
+                export_titles(Title.objects.all(), "ndjson", chunk_size=2)
+            )
+        assert len(content.splitlines()) == 5
+
+    def test_06_command(self, client, tmp_path):
+        create_catalog(3)
+        output = tmp_path / "titles.csv.gz"
+        call_command(
+            "export_titles",
+            "--file-format",
+            "csv",
+            "--gzip",
+            "--chunk-size",
+            "2",
+            "--output",
+            str(output),
+        )
+        _, content = self.get_export(client, file_format="csv")
+        assert gzip.decompress(output.read_bytes()) == content, (
+            "Проверьте, что команда export_titles выгружает каталог "
+            "так же, как эндпоинт выгрузки."
+        )
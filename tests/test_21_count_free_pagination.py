@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_catalog, create_title_with_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21CountFreePagination:
+
+    TITLES_URL = "/api/v1/titles/"
+    REVIEWS_URL_TEMPLATE = "/api/v1/titles/{title_id}/reviews/"
+    USERS_URL = "/api/v1/users/"
+
+    def test_01_count_cached_between_pages(
+        self, client, django_assert_num_queries
+    ):
+        create_catalog(12)
+        # Версии данных, COUNT(*), произведения, жанры.
+        with django_assert_num_queries(4):
+            data = client.get(self.TITLES_URL).json()
+        assert data["count"] == 12
+        # Количество берётся из кэша.
+        with django_assert_num_queries(3):
+            data = client.get(data["next"]).json()
+        assert data["count"] == 12, (
+            "Проверьте, что количество произведений на следующих "
+            "страницах берётся из кэша без COUNT(*)."
+        )
+        assert data["previous"] == "http://testserver/api/v1/titles/"
+        data = client.get(data["next"]).json()
+        assert [title["name"] for title in data["results"]] == [
+            "Произведение 10",
+            "Произведение 11",
+        ]
+        assert data["next"] is None
+
+        from reviews.models import Title
+
+        Title.objects.create(name="Новое", year=2000)
+        assert client.get(self.TITLES_URL).json()["count"] == 13, (
+            "Проверьте, что количество пересчитывается после изменения "
+            "каталога."
+        )
+
+    def test_02_without_count(self, client, django_assert_num_queries):
+        create_catalog(12)
+        with django_assert_num_queries(3):
+            data = client.get(self.TITLES_URL, {"count": "false"}).json()
+        assert "count" not in data, (
+            "Проверьте, что с параметром `count=false` количество "
+            "записей не выводится."
+        )
+        assert len(data["results"]) == 5
+        assert "count=false" in data["next"]
+
+    def test_03_filtered_count(self, client):
+        create_catalog(12)
+        data = client.get(self.TITLES_URL, {"category": "cat-1"}).json()
+        assert data["count"] == 6
+        data = client.get(self.TITLES_URL, {"genre": "genre-2"}).json()
+        assert data["count"] == 4
+
+    def test_04_last_and_invalid_pages(self, client):
+        create_catalog(12)
+        data = client.get(self.TITLES_URL, {"page": "last"}).json()
+        assert len(data["results"]) == 2
+        response = client.get(
+            self.TITLES_URL, {"page": "last", "count": "false"}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            "Проверьте, что `page=last` работает и с параметром "
+            "`count=false`."
+        )
+        data = response.json()
+        assert "count" not in data
+        assert [title["name"] for title in data["results"]] == [
+            "Произведение 10",
+            "Произведение 11",
+        ]
+        for page in (0, 4, "abc"):
+            response = client.get(self.TITLES_URL, {"page": page})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                "Проверьте, что запрос несуществующей страницы "
+                "возвращает ответ со статусом 404."
+            )
+
+    def test_05_reviews_and_users(
+        self, admin_client, django_user_model
+    ):
+        title = create_title_with_reviews(django_user_model, 7)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        assert admin_client.get(url).json()["count"] == 7
+        data = admin_client.get(url, {"page": 2, "count": "0"}).json()
+        assert "count" not in data
+        assert len(data["results"]) == 2
+
+        count = django_user_model.objects.count()
+        assert admin_client.get(self.USERS_URL).json()["count"] == count
+        django_user_model.objects.create_user(
+            username="new", email="new@yamdb.fake"
+        )
+        assert admin_client.get(self.USERS_URL).json()["count"] == (
+            count + 1
+        ), "Проверьте, что количество пользователей пересчитывается."
+
+    def test_06_count_survives_review_writes(
+        self, client, django_user_model, django_assert_num_queries
+    ):
+        from reviews.models import Review
+
+        titles = create_catalog(12)
+        assert client.get(self.TITLES_URL).json()["count"] == 12
+        author = django_user_model.objects.create_user(
+            username="critic", email="critic@yamdb.fake"
+        )
+        Review.objects.create(
+            title=titles[0], author=author, text="Отзыв", score=8
+        )
+        # Ответ пересобирается (рейтинг изменился), а количество
+        # берётся из кэша: отзывы не меняют состав произведений.
+        with django_assert_num_queries(3) as context:
+            data = client.get(self.TITLES_URL).json()
+        assert data["count"] == 12
+        assert data["results"][0]["rating"] == 8
+        assert not any(
+            "COUNT(" in query["sql"] for query in context.captured_queries
+        ), (
+            "Проверьте, что запись отзыва не сбрасывает кэшированное "
+            "количество произведений."
+        )
@@ -0,0 +1,153 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_catalog
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22MultiGenreFilter:
+
+    TITLES_URL = "/api/v1/titles/"
+
+    def get_names(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [title["name"] for title in response.json()["results"]]
+
+    def test_01_all_and_any(self, client):
+        create_catalog(6)
+        assert self.get_names(client, genre="genre-1,genre-2") == [
+            "Произведение 2",
+            "Произведение 5",
+        ], (
+            "Проверьте, что фильтр по нескольким жанрам возвращает "
+            "произведения со всеми указанными жанрами."
+        )
+        assert self.get_names(
+            client, genre="genre-2,genre-1", genre_mode="any"
+        ) == [
+            "Произведение 1",
+            "Произведение 2",
+            "Произведение 4",
+            "Произведение 5",
+        ], (
+            "Проверьте, что с параметром `genre_mode=any` фильтр "
+            "возвращает произведения хотя бы с одним из жанров."
+        )
+        assert self.get_names(client, genre="genre-1,unknown") == []
+        assert len(
+            self.get_names(client, genre="genre-0,unknown", genre_mode="any")
+        ) == 5
+
+    def test_02_invalid_mode(self, client):
+        response = client.get(
+            self.TITLES_URL, {"genre": "genre-0", "genre_mode": "none"}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_index_follows_writes(
+        self, client, admin_client, django_assert_num_queries
+    ):
+        from reviews.models import Genre
+
+        titles = create_catalog(3)
+        params = {"genre": "genre-0,genre-2"}
+        assert self.get_names(client, **params) == ["Произведение 2"]
+        # Битовые карты уже построены: версии данных, произведения
+        # и их жанры.
+        with django_assert_num_queries(3):
+            self.get_names(client, **params, name="Произведение 2")
+
+        titles[0].genre.add(Genre.objects.get(slug="genre-2"))
+        assert self.get_names(client, **params) == [
+            "Произведение 0",
+            "Произведение 2",
+        ], (
+            "Проверьте, что фильтр по нескольким жанрам учитывает "
+            "изменение жанров произведения."
+        )
+        response = admin_client.patch(
+            f"{self.TITLES_URL}bulk/",
+            data=[{"id": titles[2].id, "genre": ["genre-1"]}],
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_names(client, **params) == ["Произведение 0"]
+
+    def test_04_large_result_single_parameter(self, client, monkeypatch):
+        create_catalog(6)
+        expected = {
+            "all": self.get_names(client, genre="genre-0,genre-1"),
+            "any": self.get_names(
+                client, genre="genre-1,genre-2", genre_mode="any"
+            ),
+        }
+        monkeypatch.setattr("api.filters.GENRE_FILTER_MAX_IDS", 1)
+        with CaptureQueriesContext(connection) as context:
+            assert self.get_names(
+                client, genre="genre-0,genre-1", page=1
+            ) == expected["all"]
+            assert self.get_names(
+                client, genre="genre-1,genre-2", genre_mode="any", page=1
+            ) == expected["any"], (
+                "Проверьте, что при большом числе произведений фильтр "
+                "по жанрам возвращает тот же результат."
+            )
+        assert not any(
+            'FROM "reviews_title"' in query["sql"]
+            and "reviews_genretitle" in query["sql"]
+            for query in context.captured_queries
+        ), (
+            "Проверьте, что длинный список id передаётся в запрос "
+            "без соединений и подзапросов к связям жанров."
+        )
+
+    @pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="Журнал связей SQLite."
+    )
+    def test_05_index_applies_link_changes(self, client, admin_client):
+        from reviews.models import Genre, GenreTitleChange
+
+        titles = create_catalog(3)
+        params = {"genre": "genre-0,genre-2"}
+        assert self.get_names(client, **params) == ["Произведение 2"]
+
+        titles[2].genre.remove(Genre.objects.get(slug="genre-2"))
+        response = admin_client.post(
+            f"{self.TITLES_URL}bulk/",
+            data=[
+                {
+                    "name": "Новое произведение",
+                    "year": 2000,
+                    "genre": ["genre-0", "genre-2"],
+                    "category": "cat-1",
+                }
+            ],
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        with CaptureQueriesContext(connection) as context:
+            names = self.get_names(client, **params)
+        assert names == ["Новое произведение"], (
+            "Проверьте, что фильтр по нескольким жанрам учитывает "
+            "удалённые и массово созданные связи."
+        )
+        assert not any(
+            'FROM "reviews_genretitle"' in query["sql"]
+            and " WHERE " not in query["sql"]
+            for query in context.captured_queries
+        ), (
+            "Проверьте, что индекс жанров применяет изменения связей "
+            "из журнала, а не перестраивается целиком."
+        )
+
+        # Журнал прорежен дальше последней применённой записи.
+        GenreTitleChange.objects.all().delete()
+        titles[0].genre.add(Genre.objects.get(slug="genre-2"))
+        assert self.get_names(client, **params) == [
+            "Произведение 0",
+            "Новое произведение",
+        ]
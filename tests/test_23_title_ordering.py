@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from tests.utils import create_catalog
+
+
+def create_rated_catalog():
+    from reviews.models import Title
+
+    titles = create_catalog(7)
+    for idx, title in enumerate(titles):
+        Title.objects.filter(pk=title.pk).update(
+            name=f"Произведение {(idx * 3) % 7}",
+            year=1990 + (idx * 5) % 7,
+            rating=None if idx == 3 else (idx * 4) % 7 + 1,
+            review_count=(idx * 2) % 7,
+        )
+    return list(Title.objects.order_by("id"))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleOrdering:
+
+    TITLES_URL = "/api/v1/titles/"
+
+    def walk(self, client, **params):
+        data = client.get(self.TITLES_URL, params).json()
+        ids = [title["id"] for title in data["results"]]
+        while data["next"]:
+            data = client.get(data["next"]).json()
+            ids.extend(title["id"] for title in data["results"])
+        return ids
+
+    @pytest.mark.parametrize(
+        "ordering", ("year", "-year", "name", "-name", "review_count")
+    )
+    def test_01_ordering(self, client, ordering):
+        titles = create_rated_catalog()
+        name = ordering.lstrip("-")
+        expected = [
+            title.id
+            for title in sorted(
+                titles,
+                key=lambda title: (getattr(title, name), title.id),
+                reverse=ordering.startswith("-"),
+            )
+        ]
+        assert self.walk(client, ordering=ordering) == expected, (
+            f"Проверьте, что параметр `ordering={ordering}` сортирует "
+            "произведения."
+        )
+        assert self.walk(
+            client, ordering=ordering, pagination="cursor"
+        ) == expected, (
+            "Проверьте, что курсорная пагинация учитывает сортировку."
+        )
+        assert self.walk(
+            client, ordering=ordering, pagination="cursor", fields="id"
+        ) == expected
+
+    def test_02_rating_ordering(self, client):
+        titles = create_rated_catalog()
+        rated = sorted(
+            (title for title in titles if title.rating is not None),
+            key=lambda title: (title.rating, title.id),
+            reverse=True,
+        )
+        ids = self.walk(client, ordering="-rating", pagination="cursor")
+        assert ids[:len(rated)] == [title.id for title in rated], (
+            "Проверьте, что `ordering=-rating` сортирует произведения "
+            "по убыванию рейтинга."
+        )
+        assert len(ids) == len(titles)
+
+    def test_03_invalid_ordering(self, client):
+        response = client.get(self.TITLES_URL, {"ordering": "description"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="План запроса SQLite."
+    )
+    @pytest.mark.parametrize(
+        "ordering", ("rating", "-rating", "-year", "name", "-review_count")
+    )
+    def test_04_ordering_uses_index(self, ordering):
+        from api.filters import TitleFilter
+        from api.views import TitleViewSet
+
+        create_catalog(1)
+        plan = (
+            TitleFilter({"ordering": ordering}, queryset=TitleViewSet.queryset)
+            .qs[:5]
+            .explain()
+        )
+        assert "TEMP B-TREE" not in plan, (
+            f"Проверьте, что сортировка `{ordering}` читается по индексу, "
+            "без сортировки всей выборки."
+        )
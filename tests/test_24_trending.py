@@ -0,0 +1,119 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from tests.utils import create_catalog
+
+
+def create_review(django_user_model, monkeypatch, title, score, days_ago=0):
+    from reviews.models import Review
+
+    index = Review.objects.count()
+    author = django_user_model.objects.create_user(
+        username=f"trend{index}", email=f"trend{index}@yamdb.fake"
+    )
+    published = timezone.now() - timedelta(days=days_ago)
+    with monkeypatch.context() as patch:
+        patch.setattr(timezone, "now", lambda: published)
+        return Review.objects.create(
+            title=title, author=author, text="Отзыв", score=score
+        )
+
+
+def get_trending_scores():
+    from reviews.models import Title
+
+    return dict(Title.objects.values_list("id", "trending_score"))
+
+
+def get_rebuilt_scores():
+    from reviews.models import Title
+
+    Title.objects.all().rebuild_trending()
+    return get_trending_scores()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Trending:
+
+    TRENDING_URL = "/api/v1/titles/trending/"
+
+    def test_01_recent_activity_ranks_first(
+        self, client, django_user_model, monkeypatch
+    ):
+        old, recent, _ = create_catalog(3)
+        for _ in range(2):
+            create_review(django_user_model, monkeypatch, old, 5, 28)
+        create_review(django_user_model, monkeypatch, recent, 5)
+        response = client.get(self.TRENDING_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert [title["id"] for title in response.json()] == [
+            recent.id,
+            old.id,
+        ], (
+            f"Проверьте, что `{self.TRENDING_URL}` ставит выше произведения "
+            "с недавними отзывами и не выводит произведения без отзывов."
+        )
+        scores = get_trending_scores()
+        assert scores[old.id] / scores[recent.id] == pytest.approx(2 / 16), (
+            "Проверьте, что вклад отзыва уменьшается вдвое за каждый "
+            "период полураспада."
+        )
+
+    def test_02_incremental_updates_match_rebuild(
+        self, django_user_model, monkeypatch
+    ):
+        first, second = create_catalog(2)
+        review = create_review(django_user_model, monkeypatch, first, 8, 3)
+        create_review(django_user_model, monkeypatch, first, 4, 10)
+        create_review(django_user_model, monkeypatch, second, 6, 1)
+        review.score = 2
+        review.save()
+        review.title = second
+        review.save()
+        scores = get_trending_scores()
+        assert scores == pytest.approx(get_rebuilt_scores()), (
+            "Проверьте, что трендовые очки обновляются при изменении "
+            "отзывов так же, как при пересчёте по таблице отзывов."
+        )
+        review.delete()
+        scores = get_trending_scores()
+        assert scores == pytest.approx(get_rebuilt_scores())
+
+    def test_03_rescale(self, django_user_model, monkeypatch):
+        from reviews.models import TrendingEpoch
+
+        titles = create_catalog(2)
+        create_review(django_user_model, monkeypatch, titles[0], 9, 2)
+        create_review(django_user_model, monkeypatch, titles[1], 3)
+        before = get_trending_scores()
+        call_command("rescale_trending", stdout=None)
+        assert TrendingEpoch.objects.count() == 1
+        after = get_trending_scores()
+        assert after[titles[0].id] / after[titles[1].id] == pytest.approx(
+            before[titles[0].id] / before[titles[1].id]
+        ), "Проверьте, что перенос эпохи не меняет порядок произведений."
+        assert after[titles[1].id] == pytest.approx(3, rel=1e-3)
+        create_review(django_user_model, monkeypatch, titles[1], 3)
+        assert get_trending_scores() == pytest.approx(get_rebuilt_scores())
+
+    def test_04_no_reviews_scan(
+        self, client, django_user_model, monkeypatch, django_assert_num_queries
+    ):
+        title = create_catalog(1)[0]
+        create_review(django_user_model, monkeypatch, title, 7)
+        # Версии данных, произведения с категорией и их жанры.
+        with django_assert_num_queries(3) as context:
+            response = client.get(self.TRENDING_URL, {"limit": 5})
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            "reviews_review" in query["sql"]
+            for query in context.captured_queries
+        ), "Проверьте, что тренды не читают таблицу отзывов."
+
+    def test_05_invalid_limit(self, client):
+        response = client.get(self.TRENDING_URL, {"limit": 0})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
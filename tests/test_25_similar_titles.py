@@ -0,0 +1,175 @@
+import math
+import random
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_catalog
+
+
+def compute_similar(**options):
+    call_command("compute_similar_titles", stdout=None, **options)
+
+
+def brute_force_similarity(weight):
+    """Сходство произведений, посчитанное по определению."""
+    from reviews.models import GenreTitle, Review, Title
+
+    title_ids = list(Title.objects.values_list("id", flat=True))
+    genres = {title_id: set() for title_id in title_ids}
+    for title_id, genre_id in GenreTitle.objects.values_list(
+        "title_id", "genre_id"
+    ):
+        genres[title_id].add(genre_id)
+    by_author = {}
+    for author_id, title_id, score in Review.objects.values_list(
+        "author_id", "title_id", "score"
+    ):
+        by_author.setdefault(author_id, {})[title_id] = score
+    centered = {title_id: {} for title_id in title_ids}
+    for author_id, scores in by_author.items():
+        mean = sum(scores.values()) / len(scores)
+        for title_id, score in scores.items():
+            centered[title_id][author_id] = score - mean
+
+    def cosine(left, right):
+        dot = sum(value * right.get(key, 0) for key, value in left.items())
+        norm = math.sqrt(sum(v * v for v in left.values())) * math.sqrt(
+            sum(v * v for v in right.values())
+        )
+        return dot / norm if norm else 0
+
+    genres = {
+        title_id: dict.fromkeys(genre_ids, 1)
+        for title_id, genre_ids in genres.items()
+    }
+    return {
+        (first, second): weight * cosine(genres[first], genres[second])
+        + (1 - weight) * cosine(centered[first], centered[second])
+        for first in title_ids
+        for second in title_ids
+        if first != second
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SimilarTitles:
+
+    SIMILAR_URL_TEMPLATE = "/api/v1/titles/{title_id}/similar/"
+
+    def get_similar_ids(self, client, title_id):
+        response = client.get(
+            self.SIMILAR_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return [title["id"] for title in response.json()]
+
+    def test_01_genre_overlap(self, client):
+        titles = create_catalog(4)
+        assert self.get_similar_ids(client, titles[0].id) == []
+        compute_similar()
+        assert self.get_similar_ids(client, titles[0].id) == [
+            titles[3].id,
+            titles[1].id,
+            titles[2].id,
+        ], (
+            "Проверьте, что похожие произведения упорядочены по степени "
+            "совпадения жанров."
+        )
+
+    def test_02_correlated_scores(self, client, django_user_model):
+        from reviews.models import Review, Title
+
+        first, second, third = (
+            Title.objects.create(name=f"Произведение {idx}", year=2000)
+            for idx in range(3)
+        )
+        for idx in range(3):
+            author = django_user_model.objects.create_user(
+                username=f"critic{idx}", email=f"critic{idx}@yamdb.fake"
+            )
+            for title, score in ((first, 9), (second, 8 + idx), (third, 2)):
+                Review.objects.create(
+                    title=title, author=author, text="Отзыв", score=score
+                )
+        compute_similar()
+        assert self.get_similar_ids(client, first.id) == [second.id], (
+            "Проверьте, что похожими считаются произведения, которые "
+            "одни и те же авторы оценили одинаково."
+        )
+
+    def test_03_matches_definition(self, django_user_model):
+        from api_yamdb.constants import SIMILAR_GENRE_WEIGHT
+        from reviews.models import Review, SimilarTitle
+        from reviews.similarity import iter_similar
+
+        rng = random.Random(20)
+        titles = create_catalog(9)
+        for idx in range(6):
+            author = django_user_model.objects.create_user(
+                username=f"critic{idx}", email=f"critic{idx}@yamdb.fake"
+            )
+            for title in rng.sample(titles, 5):
+                Review.objects.create(
+                    title=title,
+                    author=author,
+                    text="Отзыв",
+                    score=rng.randint(1, 10),
+                )
+        expected = brute_force_similarity(SIMILAR_GENRE_WEIGHT)
+        compute_similar(limit=3)
+        for title in titles:
+            links = list(
+                SimilarTitle.objects.filter(title=title).order_by("-score")
+            )
+            best = sorted(
+                (
+                    score
+                    for (first, _), score in expected.items()
+                    if first == title.id and score > 1e-6
+                ),
+                reverse=True,
+            )[:3]
+            assert [link.score for link in links] == pytest.approx(
+                best, abs=1e-5
+            )
+            for link in links:
+                assert link.score == pytest.approx(
+                    expected[(title.id, link.similar_id)], abs=1e-5
+                )
+        stored = SimilarTitle.objects.order_by("title", "-score", "similar")
+        assert list(iter_similar(3, block_size=2)) == [
+            (link.title_id, link.similar_id, link.score) for link in stored
+        ], "Проверьте, что расчёт блоками не зависит от размера блока."
+
+    def test_04_reads(self, client, django_assert_num_queries):
+        titles = create_catalog(3)
+        compute_similar()
+        url = self.SIMILAR_URL_TEMPLATE.format(title_id=titles[1].id)
+        # Произведение, похожие с категориями, их жанры.
+        with django_assert_num_queries(3):
+            response = client.get(url)
+        assert response.json()[0]["genre"]
+        response = client.get(self.SIMILAR_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        titles[2].delete()
+        assert self.get_similar_ids(client, titles[1].id) == [titles[0].id]
+
+    def test_05_block_size_follows_budget(self):
+        from api_yamdb.constants import SIMILAR_MEMORY_BUDGET
+        from reviews.similarity import BLOCK_ENTRY_BYTES, get_block_size
+
+        for count in (10, 10 ** 4, 10 ** 6):
+            block_size = get_block_size(count)
+            assert (
+                block_size * count * BLOCK_ENTRY_BYTES
+                <= SIMILAR_MEMORY_BUDGET
+                or block_size == 1
+            ), (
+                "Проверьте, что блок сходств укладывается в "
+                "SIMILAR_MEMORY_BUDGET при любом числе произведений."
+            )
+        assert get_block_size(10 ** 4) > get_block_size(10 ** 6)
+        assert get_block_size(10 ** 12) == 1
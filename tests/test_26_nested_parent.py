@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+def count_selects(context, table):
+    return sum(
+        query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26NestedParent:
+
+    REVIEWS_URL_TEMPLATE = "/api/v1/titles/{title_id}/reviews/"
+    COMMENTS_URL_TEMPLATE = (
+        "/api/v1/titles/{title_id}/reviews/{review_id}/comments/"
+    )
+
+    def test_01_parent_resolved_once(
+        self, admin_client, admin, user_client, user
+    ):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client}
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]["id"]),
+                data={"text": "Отзыв", "score": 7},
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert count_selects(context, "reviews_title") == 1, (
+            "Проверьте, что произведение из URL при создании отзыва "
+            "выбирается из БД один раз."
+        )
+
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]["id"], review_id=reviews[0]["id"]
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={"text": "Комментарий"})
+        assert response.status_code == HTTPStatus.CREATED
+        assert count_selects(context, "reviews_review") == 1, (
+            "Проверьте, что отзыв из URL при создании комментария "
+            "выбирается из БД один раз."
+        )
+
+    def test_02_review_must_belong_to_title(
+        self, admin_client, admin, user_client, user
+    ):
+        from reviews.models import Comment
+
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]["id"], review_id=reviews[0]["id"]
+        )
+        assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            "Проверьте, что комментарии отзыва недоступны по адресу "
+            "с чужим произведением."
+        )
+        response = user_client.post(url, data={"text": "Комментарий"})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert not Comment.objects.exists(), (
+            "Проверьте, что комментарий нельзя добавить к отзыву "
+            "по адресу с чужим произведением."
+        )
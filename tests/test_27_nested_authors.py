@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_review_comments, create_title_with_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27NestedAuthors:
+
+    REVIEWS_URL_TEMPLATE = "/api/v1/titles/{title_id}/reviews/"
+    COMMENTS_URL_TEMPLATE = (
+        "/api/v1/titles/{title_id}/reviews/{review_id}/comments/"
+    )
+    # Версии данных, родительский объект из URL и объект вместе
+    # с автором.
+    RETRIEVE_QUERIES = 3
+    # Версии данных, родительский объект, COUNT(*), страница вместе
+    # с авторами.
+    LIST_QUERIES = 4
+
+    @pytest.mark.parametrize("count", (6, 14))
+    def test_01_flat_query_count(
+        self, client, django_user_model, django_assert_num_queries, count
+    ):
+        title = create_title_with_reviews(django_user_model, count)
+        review = title.reviews.first()
+        create_review_comments(django_user_model, review, count)
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ),
+        )
+        for url in urls:
+            with django_assert_num_queries(self.LIST_QUERIES):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert all(item["author"] for item in response.json()["results"])
+
+        detail_urls = (
+            f"{urls[0]}{review.id}/",
+            f"{urls[1]}{review.comments.first().id}/",
+        )
+        for url in detail_urls:
+            with django_assert_num_queries(self.RETRIEVE_QUERIES):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()["author"], (
+                f"Проверьте, что GET-запрос к `{url}` выбирает имя автора "
+                "в одном запросе с объектом."
+            )
@@ -0,0 +1,194 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import (
+    create_comments,
+    create_review_comments,
+    create_title_with_reviews,
+)
+
+
+def get_comment_counts():
+    from reviews.models import Review
+
+    return dict(Review.objects.values_list("id", "comment_count"))
+
+
+def get_rebuilt_counts():
+    from reviews.models import Review
+
+    Review.objects.all().rebuild_comment_counts()
+    return get_comment_counts()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28CommentCounts:
+
+    TITLE_URL_TEMPLATE = "/api/v1/titles/{title_id}/"
+    REVIEWS_URL_TEMPLATE = "/api/v1/titles/{title_id}/reviews/"
+    COMMENTS_URL_TEMPLATE = (
+        "/api/v1/titles/{title_id}/reviews/{review_id}/comments/"
+    )
+
+    def test_01_api_writes(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]["id"]
+        )
+        review_url = f"{reviews_url}{reviews[0]['id']}/"
+        assert admin_client.get(review_url).json()["comment_count"] == 2, (
+            f"Проверьте, что GET-запрос к `{review_url}` возвращает "
+            "количество комментариев к отзыву в поле `comment_count`."
+        )
+        listed = {
+            review["id"]: review["comment_count"]
+            for review in admin_client.get(reviews_url).json()["results"]
+        }
+        assert listed == {reviews[0]["id"]: 2, reviews[1]["id"]: 0}, (
+            f"Проверьте, что список `{reviews_url}` учитывает новые "
+            "комментарии."
+        )
+        title_url = self.TITLE_URL_TEMPLATE.format(title_id=titles[0]["id"])
+        assert admin_client.get(title_url).json()["review_count"] == 2, (
+            f"Проверьте, что GET-запрос к `{title_url}` возвращает "
+            "количество отзывов в поле `review_count`."
+        )
+
+        comment_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]["id"], review_id=reviews[0]["id"]
+        ) + f"{comments[1]['id']}/"
+        response = user_client.delete(comment_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert admin_client.get(review_url).json()["comment_count"] == 1
+        response = admin_client.patch(
+            review_url, data={"comment_count": 10}, format="json"
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["comment_count"] == 1, (
+            "Проверьте, что поле `comment_count` доступно только "
+            "для чтения."
+        )
+
+    def test_02_cascades(self, django_user_model):
+        from reviews.models import Comment
+
+        title = create_title_with_reviews(django_user_model, 3)
+        first, second, third = title.reviews.order_by("id")
+        create_review_comments(django_user_model, first, 3)
+        moved = Comment.objects.filter(review=first).first()
+        moved.review = second
+        moved.save()
+        assert get_comment_counts() == {
+            first.id: 2,
+            second.id: 1,
+            third.id: 0,
+        }, "Проверьте, что счётчик учитывает перенос комментария."
+
+        django_user_model.objects.get(username="commenter2").delete()
+        assert get_comment_counts() == get_rebuilt_counts(), (
+            "Проверьте, что счётчик комментариев уменьшается "
+            "при каскадном удалении комментариев вместе с автором."
+        )
+        first.delete()
+        assert get_comment_counts() == get_rebuilt_counts()
+
+    def test_03_rebuild(self, django_user_model):
+        from reviews.models import Review
+
+        title = create_title_with_reviews(django_user_model, 2)
+        review = title.reviews.first()
+        create_review_comments(django_user_model, review, 2)
+        Review.objects.update(comment_count=0)
+        call_command("rebuild_ratings", stdout=None)
+        assert get_comment_counts()[review.id] == 2
+
+    def test_04_no_extra_queries(
+        self, client, django_user_model, django_assert_num_queries
+    ):
+        title = create_title_with_reviews(django_user_model, 2)
+        review = title.reviews.first()
+        create_review_comments(django_user_model, review, 3)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        # Версии данных, произведение из URL и отзыв вместе с автором.
+        with django_assert_num_queries(3):
+            response = client.get(f"{url}{review.id}/")
+        assert response.json()["comment_count"] == 3
+        # Версии данных, произведение из URL и страница отзывов: все
+        # отзывы помещаются на одну страницу, поэтому COUNT(*) не нужен.
+        with django_assert_num_queries(3):
+            response = client.get(url)
+        assert {
+            item["id"]: item["comment_count"]
+            for item in response.json()["results"]
+        }[review.id] == 3
+
+    def test_05_stale_review_save_keeps_count(self, django_user_model):
+        from reviews.models import Review
+
+        title = create_title_with_reviews(django_user_model, 1)
+        stale = Review.objects.get(title=title)
+        create_review_comments(django_user_model, stale, 2)
+        stale.text = "Новый текст"
+        stale.save()
+        review = Review.objects.get(pk=stale.pk)
+        assert review.text == "Новый текст"
+        assert review.comment_count == 2, (
+            "Проверьте, что сохранение отзыва не затирает счётчик "
+            "комментариев, изменённый параллельно."
+        )
+
+    def test_06_cascade_delete_queries(self, django_user_model):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from api.cache import author_scope, get_versions
+        from reviews.models import Comment, Title
+
+        def delete_title(title):
+            with CaptureQueriesContext(connection) as context:
+                title.delete()
+            return len(context.captured_queries)
+
+        small = create_title_with_reviews(django_user_model, 1)
+        review = small.reviews.get()
+        Comment.objects.create(
+            review=review, author=review.author, text="Комментарий"
+        )
+        small_queries = delete_title(small)
+
+        title = Title.objects.create(name="Чужой", year=1979)
+        authors = [
+            django_user_model.objects.create_user(
+                username=f"critic{idx}", email=f"critic{idx}@yamdb.fake"
+            )
+            for idx in range(5)
+        ]
+        for author in authors:
+            review = title.reviews.create(
+                author=author, text="Отзыв", score=7
+            )
+            for commenter in authors[:3]:
+                Comment.objects.create(
+                    review=review, author=commenter, text="Комментарий"
+                )
+        versions = get_versions(
+            *map(author_scope, (a.pk for a in authors))
+        )
+        assert delete_title(title) == small_queries, (
+            "Проверьте, что число запросов при удалении произведения "
+            "не зависит от количества его отзывов и комментариев."
+        )
+        assert not Title.objects.filter(pk=title.pk).exists()
+        new_versions = get_versions(
+            *map(author_scope, (a.pk for a in authors))
+        )
+        assert all(
+            new != old for new, old in zip(new_versions, versions)
+        ), (
+            "Проверьте, что удаление произведения сбрасывает кеш "
+            "ленты активности авторов отзывов и комментариев."
+        )
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from tests.utils import create_catalog
+
+
+def create_reviews(django_user_model, monkeypatch, titles, counts):
+    from reviews.models import Review
+
+    authors = [
+        django_user_model.objects.create_user(
+            username=f"reader{idx}", email=f"reader{idx}@yamdb.fake"
+        )
+        for idx in range(max(counts))
+    ]
+    now = timezone.now()
+    for title, count in zip(titles, counts):
+        for idx, author in enumerate(authors[:count]):
+            published = now - timedelta(hours=idx % 3)
+            with monkeypatch.context() as patch:
+                patch.setattr(timezone, "now", lambda: published)
+                Review.objects.create(
+                    title=title, author=author, text="Отзыв", score=idx + 1
+                )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29LatestReviews:
+
+    URL = "/api/v1/reviews/"
+    REVIEWS_URL_TEMPLATE = "/api/v1/titles/{title_id}/reviews/"
+
+    def test_01_matches_nested_lists(
+        self, client, django_user_model, monkeypatch
+    ):
+        titles = create_catalog(4)
+        create_reviews(django_user_model, monkeypatch, titles, (5, 2, 0, 4))
+        title_ids = [titles[idx].id for idx in (2, 0, 1)]
+        response = client.get(
+            self.URL,
+            {"title_ids": ",".join(map(str, title_ids)), "per_title": 3},
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert list(data) == [str(title_id) for title_id in title_ids], (
+            f"Проверьте, что `{self.URL}` возвращает отзывы для каждого "
+            "произведения из `title_ids`, в том числе без отзывов."
+        )
+        for title_id in title_ids:
+            nested = client.get(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+            ).json()["results"]
+            assert data[str(title_id)] == nested[:3], (
+                f"Проверьте, что `{self.URL}` возвращает последние отзывы "
+                "произведения в том же формате и порядке, что и список "
+                "отзывов произведения."
+            )
+
+    def test_02_single_query(
+        self,
+        client,
+        django_user_model,
+        monkeypatch,
+        django_assert_num_queries,
+    ):
+        titles = create_catalog(3)
+        create_reviews(django_user_model, monkeypatch, titles, (4, 4, 4))
+        params = {"title_ids": ",".join(str(title.id) for title in titles)}
+        # Версии данных и отзывы.
+        with django_assert_num_queries(2) as context:
+            response = client.get(self.URL, params)
+        assert all(len(reviews) == 3 for reviews in response.json().values())
+        assert "ROW_NUMBER" in context.captured_queries[1]["sql"], (
+            f"Проверьте, что `{self.URL}` выбирает отзывы одним запросом "
+            "с оконной функцией ROW_NUMBER()."
+        )
+
+    @pytest.mark.parametrize(
+        "params",
+        (
+            {},
+            {"title_ids": "1,abc"},
+            {"title_ids": ",".join(map(str, range(1, 102)))},
+            {"title_ids": "1", "per_title": 0},
+            {"title_ids": "1", "per_title": 21},
+        ),
+    )
+    def test_03_invalid_params(self, client, params):
+        response = client.get(self.URL, params)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
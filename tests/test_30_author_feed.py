@@ -0,0 +1,134 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from tests.utils import create_catalog
+
+
+def create_activity(author, other, monkeypatch, count):
+    """Отзывы и комментарии автора вперемешку с чужими,
+    часть записей с одинаковой датой публикации.
+    """
+    from reviews.models import Comment, Review
+
+    titles = create_catalog(count)
+    now = timezone.now()
+    for idx, title in enumerate(titles):
+        published = now - timedelta(hours=idx // 2)
+        with monkeypatch.context() as patch:
+            patch.setattr(timezone, "now", lambda: published)
+            review = Review.objects.create(
+                title=title, author=author, text=f"Отзыв {idx}", score=5
+            )
+            Review.objects.create(
+                title=title, author=other, text="Чужой отзыв", score=5
+            )
+            Comment.objects.create(
+                review=review, author=author, text=f"Комментарий {idx}"
+            )
+            Comment.objects.create(
+                review=review, author=other, text="Чужой комментарий"
+            )
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30AuthorFeed:
+
+    URL_TEMPLATE = "/api/v1/users/{username}/{feed}/"
+
+    def walk(self, client, url):
+        data = client.get(url).json()
+        assert "count" not in data, (
+            f"Проверьте, что `{url}` использует курсорную пагинацию "
+            "без подсчёта записей."
+        )
+        items = list(data["results"])
+        while data["next"]:
+            data = client.get(data["next"]).json()
+            items.extend(data["results"])
+        return items
+
+    @pytest.mark.parametrize("feed", ("reviews", "comments"))
+    def test_01_feed(
+        self, client, user_client, user, admin, monkeypatch, feed
+    ):
+        from reviews.models import Comment, Review
+
+        create_activity(user, admin, monkeypatch, 7)
+        model = Review if feed == "reviews" else Comment
+        expected = list(
+            model.objects.filter(author=user)
+            .order_by("-pub_date", "-id")
+            .values_list("id", flat=True)
+        )
+        url = self.URL_TEMPLATE.format(username=user.username, feed=feed)
+        items = self.walk(client, url)
+        assert [item["id"] for item in items] == expected, (
+            f"Проверьте, что `{url}` выводит все записи пользователя "
+            "от новых к старым."
+        )
+        assert all(item["author"] == user.username for item in items)
+        me_url = self.URL_TEMPLATE.format(username="me", feed=feed)
+        assert self.walk(user_client, me_url) == items, (
+            f"Проверьте, что `{me_url}` выводит записи текущего "
+            "пользователя."
+        )
+        response = client.get(me_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_02_fields(self, client, user, admin, monkeypatch):
+        from reviews.models import Comment
+
+        titles = create_activity(user, admin, monkeypatch, 1)
+        comment = Comment.objects.get(author=user)
+        review = client.get(
+            self.URL_TEMPLATE.format(username=user.username, feed="reviews")
+        ).json()["results"][0]
+        assert review["title"] == titles[0].id
+        assert review["comment_count"] == 2
+        data = client.get(
+            self.URL_TEMPLATE.format(username=user.username, feed="comments")
+        ).json()["results"][0]
+        assert data == {
+            "id": comment.id,
+            "text": comment.text,
+            "author": user.username,
+            "pub_date": data["pub_date"],
+            "review": comment.review_id,
+            "title": titles[0].id,
+        }, (
+            "Проверьте, что в ленте комментариев выводятся id отзыва "
+            "и произведения."
+        )
+
+    def test_03_unknown_user_and_cache(self, client, user, admin, monkeypatch):
+        from reviews.models import Review
+
+        url = self.URL_TEMPLATE.format(username="nobody", feed="reviews")
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+        create_activity(user, admin, monkeypatch, 1)
+        url = self.URL_TEMPLATE.format(username=user.username, feed="reviews")
+        etag = client.get(url)["ETag"]
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        Review.objects.filter(author=user).first().delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["results"] == []
+
+    @pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="План запроса SQLite."
+    )
+    @pytest.mark.parametrize("feed", ("reviews", "comments"))
+    def test_04_feed_uses_index(self, user, feed):
+        queryset = getattr(user, feed).order_by("-pub_date", "-id")[:10]
+        plan = queryset.explain()
+        assert "author_pub_date_idx" in plan and "TEMP B-TREE" not in plan, (
+            "Проверьте, что лента автора читается по индексу "
+            "(author, -pub_date, -id) без сортировки."
+        )
@@ -291,3 +291,52 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f"данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не "
         "найдено или не является целым числом."
     )
+
+
+def create_catalog(title_count):
+    from reviews.models import Category, Genre, Title
+
+    categories = [
+        Category.objects.create(name=f"Категория {idx}", slug=f"cat-{idx}")
+        for idx in range(2)
+    ]
+    genres = [
+        Genre.objects.create(name=f"Жанр {idx}", slug=f"genre-{idx}")
+        for idx in range(3)
+    ]
+    titles = []
+    for idx in range(title_count):
+        title = Title.objects.create(
+            name=f"Произведение {idx}",
+            year=2000,
+            category=categories[idx % len(categories)],
+        )
+        title.genre.set(genres[: idx % len(genres) + 1])
+        titles.append(title)
+    return titles
+
+
+def create_title_with_reviews(django_user_model, count):
+    from reviews.models import Review, Title
+
+    title = Title.objects.create(name="Терминатор", year=1984)
+    for idx in range(count):
+        author = django_user_model.objects.create_user(
+            username=f"author{idx}", email=f"author{idx}@yamdb.fake"
+        )
+        Review.objects.create(
+            title=title, author=author, text=f"Отзыв {idx}", score=5
+        )
+    return title
+
+
+def create_review_comments(django_user_model, review, count):
+    from reviews.models import Comment
+
+    for idx in range(count):
+        author = django_user_model.objects.create_user(
+            username=f"commenter{idx}", email=f"commenter{idx}@yamdb.fake"
+        )
+        Comment.objects.create(
+            review=review, author=author, text=f"Комментарий {idx}"
+        )